@@ -11,6 +11,7 @@ from flask_babel import Babel, _
 from flask_wtf.csrf import CSRFProtect, CSRFError
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+from flask_caching import Cache
 from authlib.integrations.flask_client import OAuth
 import re
 from jinja2 import ChoiceLoader, FileSystemLoader
@@ -29,6 +30,7 @@ socketio = SocketIO()
 babel = Babel()
 csrf = CSRFProtect()
 limiter = Limiter(key_func=get_remote_address, default_limits=[])
+cache = Cache()
 oauth = OAuth()
 
 
@@ -90,6 +92,7 @@ def create_app(config=None):
     socketio.init_app(app, cors_allowed_origins="*")
     oauth.init_app(app)
     csrf.init_app(app)
+    cache.init_app(app)
     try:
         # Configure limiter defaults from config if provided
         default_limits = []
@@ -18,6 +18,9 @@ class Config:
     SQLALCHEMY_ENGINE_OPTIONS = {
         'pool_pre_ping': True,
         'pool_recycle': 300,
+        # Keep the compiled SQL of every model/report statement cached
+        # (SQLAlchemy's default holds 500 statements per engine)
+        'query_cache_size': 1200,
     }
     
     # Session settings
@@ -110,6 +113,12 @@ class Config:
     RATELIMIT_DEFAULT = os.getenv('RATELIMIT_DEFAULT', '')  # e.g., "200 per day;50 per hour"
     RATELIMIT_STORAGE_URI = os.getenv('RATELIMIT_STORAGE_URI', 'memory://')
     
+    # Server-side cache (analytics API responses); use CACHE_TYPE=RedisCache with
+    # CACHE_REDIS_URL when running several workers so they share invalidation
+    CACHE_TYPE = os.getenv('CACHE_TYPE', 'SimpleCache')
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL')
+    CACHE_DEFAULT_TIMEOUT = int(os.getenv('CACHE_DEFAULT_TIMEOUT', 300))
+    
     # Internationalization
     LANGUAGES = {
         'en': 'English',
@@ -18,6 +18,7 @@ from .rate_override import RateOverride
 from .saved_filter import SavedFilter
 from .project_cost import ProjectCost
 from .kanban_column import KanbanColumn
+from .daily_hours_rollup import DailyHoursRollup
 
 __all__ = [
     "User",
@@ -45,4 +46,5 @@ __all__ = [
     "SavedReportView",
     "ReportEmailSchedule",
     "KanbanColumn",
+    "DailyHoursRollup",
 ]
@@ -0,0 +1,124 @@
+from sqlalchemy import DDL, event
+from app import db
+from .time_entry import TimeEntry
+
+
+class DailyHoursRollup(db.Model):
+    """Tracked seconds per day, user and project (finished entries only).
+
+    Maintained incrementally by database triggers on ``time_entries``, so every
+    insert, update and delete (ORM, bulk or raw SQL) is reflected immediately
+    and analytics read small pre-aggregated rows instead of scanning entries.
+    """
+
+    __tablename__ = 'daily_hours_rollup'
+
+    day = db.Column(db.Date, primary_key=True)
+    user_id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, primary_key=True)
+    billable_seconds = db.Column(db.BigInteger, nullable=False, default=0)
+    nonbillable_seconds = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<DailyHoursRollup {self.day} user={self.user_id} project={self.project_id}>'
+
+
+# Triggers reference time_entries, so create the rollup after it
+DailyHoursRollup.__table__.add_is_dependent_on(TimeEntry.__table__)
+
+# Full recomputation; also used to fill the table when it is created
+REBUILD_SQL = {
+    'sqlite': """
+        INSERT INTO daily_hours_rollup (day, user_id, project_id, billable_seconds, nonbillable_seconds)
+        SELECT date(start_time), user_id, project_id,
+               SUM(CASE WHEN billable THEN COALESCE(duration_seconds, 0) ELSE 0 END),
+               SUM(CASE WHEN billable THEN 0 ELSE COALESCE(duration_seconds, 0) END)
+        FROM time_entries
+        WHERE end_time IS NOT NULL
+        GROUP BY date(start_time), user_id, project_id
+    """,
+    'postgresql': """
+        INSERT INTO daily_hours_rollup (day, user_id, project_id, billable_seconds, nonbillable_seconds)
+        SELECT CAST(start_time AS date), user_id, project_id,
+               COALESCE(SUM(duration_seconds) FILTER (WHERE billable), 0),
+               COALESCE(SUM(duration_seconds) FILTER (WHERE NOT billable), 0)
+        FROM time_entries
+        WHERE end_time IS NOT NULL
+        GROUP BY 1, 2, 3
+    """,
+}
+
+# Each trigger takes the old row's seconds out of its bucket (dropping it once
+# empty, so analytics never list a day or project with nothing tracked) and
+# adds the new row's seconds to its bucket (upserting it)
+_SQLITE_SUBTRACT_OLD = """
+    UPDATE daily_hours_rollup
+    SET billable_seconds = billable_seconds - CASE WHEN OLD.billable THEN COALESCE(OLD.duration_seconds, 0) ELSE 0 END,
+        nonbillable_seconds = nonbillable_seconds - CASE WHEN OLD.billable THEN 0 ELSE COALESCE(OLD.duration_seconds, 0) END
+    WHERE OLD.end_time IS NOT NULL
+      AND day = date(OLD.start_time) AND user_id = OLD.user_id AND project_id = OLD.project_id;
+    DELETE FROM daily_hours_rollup
+    WHERE OLD.end_time IS NOT NULL
+      AND day = date(OLD.start_time) AND user_id = OLD.user_id AND project_id = OLD.project_id
+      AND billable_seconds = 0 AND nonbillable_seconds = 0;
+"""
+
+_SQLITE_ADD_NEW = """
+    INSERT INTO daily_hours_rollup (day, user_id, project_id, billable_seconds, nonbillable_seconds)
+    SELECT date(NEW.start_time), NEW.user_id, NEW.project_id,
+           CASE WHEN NEW.billable THEN COALESCE(NEW.duration_seconds, 0) ELSE 0 END,
+           CASE WHEN NEW.billable THEN 0 ELSE COALESCE(NEW.duration_seconds, 0) END
+    WHERE NEW.end_time IS NOT NULL
+    ON CONFLICT (day, user_id, project_id) DO UPDATE
+    SET billable_seconds = billable_seconds + excluded.billable_seconds,
+        nonbillable_seconds = nonbillable_seconds + excluded.nonbillable_seconds;
+"""
+
+TRIGGER_SQL = {
+    'sqlite': [
+        "CREATE TRIGGER IF NOT EXISTS trg_time_entries_rollup_insert AFTER INSERT ON time_entries "
+        "BEGIN" + _SQLITE_ADD_NEW + "END",
+        "CREATE TRIGGER IF NOT EXISTS trg_time_entries_rollup_update AFTER UPDATE ON time_entries "
+        "BEGIN" + _SQLITE_SUBTRACT_OLD + _SQLITE_ADD_NEW + "END",
+        "CREATE TRIGGER IF NOT EXISTS trg_time_entries_rollup_delete AFTER DELETE ON time_entries "
+        "BEGIN" + _SQLITE_SUBTRACT_OLD + "END",
+    ],
+    'postgresql': [
+        """
+        CREATE OR REPLACE FUNCTION time_entries_rollup_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.end_time IS NOT NULL THEN
+                UPDATE daily_hours_rollup
+                SET billable_seconds = billable_seconds - CASE WHEN OLD.billable THEN COALESCE(OLD.duration_seconds, 0) ELSE 0 END,
+                    nonbillable_seconds = nonbillable_seconds - CASE WHEN OLD.billable THEN 0 ELSE COALESCE(OLD.duration_seconds, 0) END
+                WHERE day = CAST(OLD.start_time AS date) AND user_id = OLD.user_id AND project_id = OLD.project_id;
+                DELETE FROM daily_hours_rollup
+                WHERE day = CAST(OLD.start_time AS date) AND user_id = OLD.user_id AND project_id = OLD.project_id
+                  AND billable_seconds = 0 AND nonbillable_seconds = 0;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.end_time IS NOT NULL THEN
+                INSERT INTO daily_hours_rollup (day, user_id, project_id, billable_seconds, nonbillable_seconds)
+                VALUES (CAST(NEW.start_time AS date), NEW.user_id, NEW.project_id,
+                        CASE WHEN NEW.billable THEN COALESCE(NEW.duration_seconds, 0) ELSE 0 END,
+                        CASE WHEN NEW.billable THEN 0 ELSE COALESCE(NEW.duration_seconds, 0) END)
+                ON CONFLICT (day, user_id, project_id) DO UPDATE
+                SET billable_seconds = daily_hours_rollup.billable_seconds + EXCLUDED.billable_seconds,
+                    nonbillable_seconds = daily_hours_rollup.nonbillable_seconds + EXCLUDED.nonbillable_seconds;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        "DROP TRIGGER IF EXISTS trg_time_entries_rollup ON time_entries",
+        "CREATE TRIGGER trg_time_entries_rollup AFTER INSERT OR UPDATE OR DELETE ON time_entries "
+        "FOR EACH ROW EXECUTE PROCEDURE time_entries_rollup_apply()",
+    ],
+}
+
+for _dialect, _statements in TRIGGER_SQL.items():
+    for _statement in [REBUILD_SQL[_dialect], *_statements]:
+        event.listen(
+            DailyHoursRollup.__table__,
+            'after_create',
+            DDL(_statement).execute_if(dialect=_dialect),
+        )
@@ -245,15 +245,16 @@ class Invoice(db.Model):
         today = datetime.utcnow()
         date_prefix = today.strftime('%Y%m%d')
         
-        # Find the next available number for today
-        existing = cls.query.filter(
+        # Find the next available number for today (only the highest number
+        # is needed, not the invoice row)
+        last_number = db.session.query(cls.invoice_number).filter(
             cls.invoice_number.like(f'INV-{date_prefix}-%')
-        ).order_by(cls.invoice_number.desc()).first()
+        ).order_by(cls.invoice_number.desc()).limit(1).scalar()
         
-        if existing:
+        if last_number:
             # Extract the number part and increment
             try:
-                last_num = int(existing.invoice_number.split('-')[-1])
+                last_num = int(last_number.split('-')[-1])
                 next_num = last_num + 1
             except (ValueError, IndexError):
                 next_num = 1
@@ -1,5 +1,6 @@
 from datetime import datetime
 from decimal import Decimal
+from sqlalchemy import func, lambda_stmt, select
 from app import db
 
 class Project(db.Model):
@@ -79,30 +80,31 @@ class Project(db.Model):
         """Check if project is active"""
         return self.status == 'active'
     
+    def _tracked_seconds(self, billable_only=False):
+        """Sum of completed entry durations, as a cached lambda statement.
+
+        The statement is built once per code path; later calls only bind the
+        project id, skipping query construction and cache-key generation.
+        """
+        from .time_entry import TimeEntry
+        project_id = self.id
+        stmt = lambda_stmt(lambda: select(func.sum(TimeEntry.duration_seconds)).where(
+            TimeEntry.project_id == project_id,
+            TimeEntry.end_time.isnot(None)
+        ))
+        if billable_only:
+            stmt += lambda s: s.where(TimeEntry.billable == True)
+        return db.session.execute(stmt).scalar() or 0
+    
     @property
     def total_hours(self):
         """Calculate total hours spent on this project"""
-        from .time_entry import TimeEntry
-        total_seconds = db.session.query(
-            db.func.sum(TimeEntry.duration_seconds)
-        ).filter(
-            TimeEntry.project_id == self.id,
-            TimeEntry.end_time.isnot(None)
-        ).scalar() or 0
-        return round(total_seconds / 3600, 2)
+        return round(self._tracked_seconds() / 3600, 2)
     
     @property
     def total_billable_hours(self):
         """Calculate total billable hours spent on this project"""
-        from .time_entry import TimeEntry
-        total_seconds = db.session.query(
-            db.func.sum(TimeEntry.duration_seconds)
-        ).filter(
-            TimeEntry.project_id == self.id,
-            TimeEntry.end_time.isnot(None),
-            TimeEntry.billable == True
-        ).scalar() or 0
-        return round(total_seconds / 3600, 2)
+        return round(self._tracked_seconds(billable_only=True) / 3600, 2)
     
     @property
     def estimated_cost(self):
@@ -1,4 +1,5 @@
 from datetime import datetime
+from flask import g, has_app_context
 from app import db
 from app.config import Config
 import os
@@ -144,7 +145,16 @@ class Settings(db.Model):
     
     @classmethod
     def get_settings(cls):
-        """Get the singleton settings instance, creating it if it doesn't exist"""
+        """Get the singleton settings instance, creating it if it doesn't exist
+
+        The instance is memoized on ``flask.g`` for the current app context, as
+        long as it is still attached to the session.
+        """
+        if has_app_context():
+            cached = g.get('settings')
+            if cached is not None and cached in db.session:
+                return cached
+        
         settings = cls.query.first()
         if not settings:
             settings = cls()
@@ -159,6 +169,8 @@ class Settings(db.Model):
                 except Exception:
                     # If even flush fails, we'll work with the transient object
                     pass
+        if has_app_context():
+            g.settings = settings
         return settings
     
     @classmethod
@@ -29,6 +29,12 @@ class TimeEntry(db.Model):
     created_at = db.Column(db.DateTime, default=local_now, nullable=False)
     updated_at = db.Column(db.DateTime, default=local_now, onupdate=local_now, nullable=False)
     
+    # Range scans of one user's / one project's entries over a period (analytics, reports)
+    __table_args__ = (
+        db.Index('ix_te_user_start_billable', 'user_id', 'start_time', 'billable'),
+        db.Index('ix_te_project_start', 'project_id', 'start_time'),
+    )
+    
     # Relationships
     # user and project relationships are defined via backref in their respective models
     # task relationship is defined via backref in Task model
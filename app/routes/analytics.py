@@ -1,13 +1,98 @@
-from flask import Blueprint, render_template, request, jsonify
+from flask import Blueprint, render_template, request, jsonify, abort, make_response
 from flask_login import login_required, current_user
 from app import db
 from app.models import User, Project, TimeEntry, Settings, Task
 from datetime import datetime, timedelta
 from sqlalchemy import func, extract, case
 import calendar
+from collections import defaultdict
+from app.models.daily_hours_rollup import DailyHoursRollup
+from app.utils.daily_hours import daily_hours_available
+from app.utils.analytics_cache import cached_analytics
 
 analytics_bp = Blueprint('analytics', __name__)
 
+
+@analytics_bp.after_request
+def _revalidate_analytics_api(response):
+    """Let browsers keep API responses but revalidate them (ETag / 304)"""
+    if request.path.startswith('/api/analytics/') and response.status_code == 200:
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.add_etag()
+        response.make_conditional(request)
+    return response
+
+
+def _int_arg(name, default, maximum):
+    """Read a positive integer query argument, aborting with 400 before any query runs"""
+    if name not in request.args:
+        return default
+    value = request.args.get(name, type=int)
+    if value is None or value <= 0 or value > maximum:
+        abort(make_response(jsonify({'error': f'Invalid {name} parameter'}), 400))
+    return value
+
+
+def _parse_days(default=30):
+    """Period length in days from ``?days=`` (1-3650)"""
+    return _int_arg('days', default, 3650)
+
+
+def _daily_hours_query(start_date, end_date, *entities):
+    """Query daily_hours_rollup for the period, scoped to the current user"""
+    query = db.session.query(*entities).select_from(DailyHoursRollup).filter(
+        DailyHoursRollup.day >= start_date,
+        DailyHoursRollup.day < end_date
+    )
+    if not current_user.is_admin:
+        query = query.filter(DailyHoursRollup.user_id == current_user.id)
+    return query
+
+
+def _week_start(column):
+    """SQL expression for the Monday of the week of ``column``, as a date.
+
+    Returns None on databases without a known expression; callers then group
+    in Python.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        # Go back 6 days, then forward to the next Monday (or stay on it)
+        return func.date(column, '-6 days', 'weekday 1')
+    if dialect in ('postgresql', 'postgres'):
+        # ISO weeks start on Monday
+        return func.date(func.date_trunc('week', column))
+    return None
+
+
+def _weekly_seconds_in_python(start_date, end_date):
+    """Seconds tracked per week (keyed by Monday), summed in Python"""
+    query = db.session.query(
+        TimeEntry.start_time,
+        TimeEntry.duration_seconds
+    ).filter(
+        TimeEntry.end_time.isnot(None),
+        TimeEntry.start_time >= start_date,
+        TimeEntry.start_time <= end_date
+    )
+    
+    if not current_user.is_admin:
+        query = query.filter(TimeEntry.user_id == current_user.id)
+    
+    week_data = defaultdict(float)
+    for start_time, duration_seconds in query.all():
+        # Get the start of the week (Monday) for this entry
+        if isinstance(start_time, str):
+            entry_date = datetime.strptime(start_time, '%Y-%m-%d %H:%M:%S').date()
+        else:
+            entry_date = start_time.date() if hasattr(start_time, 'date') else start_time
+        
+        # Calculate Monday of that week
+        week_start = entry_date - timedelta(days=entry_date.weekday())
+        week_data[week_start] += duration_seconds or 0
+    return week_data
+
+
 @analytics_bp.route('/analytics')
 @login_required
 def analytics_dashboard():
@@ -28,30 +113,36 @@ def analytics_dashboard():
 
 @analytics_bp.route('/api/analytics/hours-by-day')
 @login_required
+@cached_analytics
 def hours_by_day():
     """Get hours worked per day for the last 30 days"""
-    try:
-        days = int(request.args.get('days', 30))
-    except (ValueError, TypeError):
-        return jsonify({'error': 'Invalid days parameter'}), 400
+    days = _parse_days()
     
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
     
-    # Build query based on user permissions
-    query = db.session.query(
-        func.date(TimeEntry.start_time).label('date'),
-        func.sum(TimeEntry.duration_seconds).label('total_seconds')
-    ).filter(
-        TimeEntry.end_time.isnot(None),
-        TimeEntry.start_time >= start_date,
-        TimeEntry.start_time <= end_date
-    )
-    
-    if not current_user.is_admin:
-        query = query.filter(TimeEntry.user_id == current_user.id)
-    
-    results = query.group_by(func.date(TimeEntry.start_time)).all()
+    if daily_hours_available():
+        rollup = DailyHoursRollup
+        results = _daily_hours_query(
+            start_date, end_date,
+            rollup.day,
+            func.sum(rollup.billable_seconds + rollup.nonbillable_seconds).label('total_seconds')
+        ).group_by(rollup.day).all()
+    else:
+        # Build query based on user permissions
+        query = db.session.query(
+            func.date(TimeEntry.start_time).label('date'),
+            func.sum(TimeEntry.duration_seconds).label('total_seconds')
+        ).filter(
+            TimeEntry.end_time.isnot(None),
+            TimeEntry.start_time >= start_date,
+            TimeEntry.start_time <= end_date
+        )
+        
+        if not current_user.is_admin:
+            query = query.filter(TimeEntry.user_id == current_user.id)
+        
+        results = query.group_by(func.date(TimeEntry.start_time)).all()
     
     # Create date range and fill missing dates with 0
     date_data = {}
@@ -84,26 +175,39 @@ def hours_by_day():
 
 @analytics_bp.route('/api/analytics/hours-by-project')
 @login_required
+@cached_analytics
 def hours_by_project():
     """Get total hours per project"""
-    days = int(request.args.get('days', 30))
+    days = _parse_days()
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
     
-    query = db.session.query(
-        Project.name,
-        func.sum(TimeEntry.duration_seconds).label('total_seconds')
-    ).join(TimeEntry).filter(
-        TimeEntry.end_time.isnot(None),
-        TimeEntry.start_time >= start_date,
-        TimeEntry.start_time <= end_date,
-        Project.status == 'active'
-    )
-    
-    if not current_user.is_admin:
-        query = query.filter(TimeEntry.user_id == current_user.id)
+    if daily_hours_available():
+        rollup = DailyHoursRollup
+        total_seconds = func.sum(rollup.billable_seconds + rollup.nonbillable_seconds)
+        query = _daily_hours_query(
+            start_date, end_date,
+            Project.name,
+            total_seconds.label('total_seconds')
+        ).join(Project, Project.id == rollup.project_id).filter(
+            Project.status == 'active'
+        )
+    else:
+        total_seconds = func.sum(TimeEntry.duration_seconds)
+        query = db.session.query(
+            Project.name,
+            total_seconds.label('total_seconds')
+        ).join(TimeEntry).filter(
+            TimeEntry.end_time.isnot(None),
+            TimeEntry.start_time >= start_date,
+            TimeEntry.start_time <= end_date,
+            Project.status == 'active'
+        )
+        
+        if not current_user.is_admin:
+            query = query.filter(TimeEntry.user_id == current_user.id)
     
-    results = query.group_by(Project.name).order_by(func.sum(TimeEntry.duration_seconds).desc()).limit(10).all()
+    results = query.group_by(Project.name).order_by(total_seconds.desc()).limit(10).all()
     
     labels = [project for project, _ in results]
     data = [round(seconds / 3600, 2) for _, seconds in results]
@@ -127,12 +231,13 @@ def hours_by_project():
 
 @analytics_bp.route('/api/analytics/hours-by-user')
 @login_required
+@cached_analytics
 def hours_by_user():
     """Get total hours per user (admin only)"""
     if not current_user.is_admin:
         return jsonify({'error': 'Unauthorized'}), 403
     
-    days = int(request.args.get('days', 30))
+    days = _parse_days()
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
     
@@ -162,9 +267,10 @@ def hours_by_user():
 
 @analytics_bp.route('/api/analytics/hours-by-hour')
 @login_required
+@cached_analytics
 def hours_by_hour():
     """Get hours worked by hour of day (24-hour format)"""
-    days = int(request.args.get('days', 30))
+    days = _parse_days()
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
     
@@ -203,35 +309,36 @@ def hours_by_hour():
 
 @analytics_bp.route('/api/analytics/billable-vs-nonbillable')
 @login_required
+@cached_analytics
 def billable_vs_nonbillable():
     """Get billable vs non-billable hours breakdown"""
-    days = int(request.args.get('days', 30))
+    days = _parse_days()
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
     
-    query = db.session.query(
-        TimeEntry.billable,
-        func.sum(TimeEntry.duration_seconds).label('total_seconds')
-    ).filter(
-        TimeEntry.end_time.isnot(None),
-        TimeEntry.start_time >= start_date,
-        TimeEntry.start_time <= end_date
-    )
-    
-    if not current_user.is_admin:
-        query = query.filter(TimeEntry.user_id == current_user.id)
-    
-    results = query.group_by(TimeEntry.billable).all()
-    
-    billable_hours = 0
-    nonbillable_hours = 0
+    if daily_hours_available():
+        rollup = DailyHoursRollup
+        query = _daily_hours_query(
+            start_date, end_date,
+            func.sum(rollup.billable_seconds).label('billable_seconds'),
+            func.sum(rollup.nonbillable_seconds).label('nonbillable_seconds')
+        )
+    else:
+        query = db.session.query(
+            func.sum(case((TimeEntry.billable == True, TimeEntry.duration_seconds), else_=0)).label('billable_seconds'),
+            func.sum(case((TimeEntry.billable == True, 0), else_=TimeEntry.duration_seconds)).label('nonbillable_seconds')
+        ).filter(
+            TimeEntry.end_time.isnot(None),
+            TimeEntry.start_time >= start_date,
+            TimeEntry.start_time <= end_date
+        )
+        
+        if not current_user.is_admin:
+            query = query.filter(TimeEntry.user_id == current_user.id)
     
-    for billable, total_seconds in results:
-        hours = round(total_seconds / 3600, 2)
-        if billable:
-            billable_hours = hours
-        else:
-            nonbillable_hours = hours
+    result = query.one()
+    billable_hours = round((result.billable_seconds or 0) / 3600, 2)
+    nonbillable_hours = round((result.nonbillable_seconds or 0) / 3600, 2)
     
     return jsonify({
         'labels': ['Billable', 'Non-Billable'],
@@ -246,45 +353,49 @@ def billable_vs_nonbillable():
 
 @analytics_bp.route('/api/analytics/weekly-trends')
 @login_required
+@cached_analytics
 def weekly_trends():
     """Get weekly trends over the last 12 weeks"""
-    try:
-        weeks = int(request.args.get('weeks', 12))
-    except (ValueError, TypeError):
-        return jsonify({'error': 'Invalid weeks parameter'}), 400
+    weeks = _int_arg('weeks', 12, 520)
     
     end_date = datetime.now().date()
     start_date = end_date - timedelta(weeks=weeks)
     
-    # Get all time entries and group by week in Python (database-agnostic)
-    query = db.session.query(
-        TimeEntry.start_time,
-        TimeEntry.duration_seconds
-    ).filter(
-        TimeEntry.end_time.isnot(None),
-        TimeEntry.start_time >= start_date,
-        TimeEntry.start_time <= end_date
-    )
-    
-    if not current_user.is_admin:
-        query = query.filter(TimeEntry.user_id == current_user.id)
-    
-    results = query.all()
-    
-    # Group by week in Python
-    from collections import defaultdict
-    week_data = defaultdict(float)
-    
-    for start_time, duration_seconds in results:
-        # Get the start of the week (Monday) for this entry
-        if isinstance(start_time, str):
-            entry_date = datetime.strptime(start_time, '%Y-%m-%d %H:%M:%S').date()
-        else:
-            entry_date = start_time.date() if hasattr(start_time, 'date') else start_time
-        
-        # Calculate Monday of that week
-        week_start = entry_date - timedelta(days=entry_date.weekday())
-        week_data[week_start] += duration_seconds or 0
+    # Sum per week (Monday) in the database where the dialect allows it
+    query = None
+    if daily_hours_available():
+        rollup = DailyHoursRollup
+        week_start = _week_start(rollup.day)
+        if week_start is not None:
+            query = _daily_hours_query(
+                start_date, end_date,
+                week_start.label('week_start'),
+                func.sum(rollup.billable_seconds + rollup.nonbillable_seconds).label('total_seconds')
+            )
+    else:
+        week_start = _week_start(TimeEntry.start_time)
+        if week_start is not None:
+            query = db.session.query(
+                week_start.label('week_start'),
+                func.sum(TimeEntry.duration_seconds).label('total_seconds')
+            ).filter(
+                TimeEntry.end_time.isnot(None),
+                TimeEntry.start_time >= start_date,
+                TimeEntry.start_time <= end_date
+            )
+            
+            if not current_user.is_admin:
+                query = query.filter(TimeEntry.user_id == current_user.id)
+    
+    if query is not None:
+        week_data = {}
+        for week, total_seconds in query.group_by(week_start).all():
+            # Handle both string and date object returns from different databases
+            if isinstance(week, str):
+                week = datetime.strptime(week, '%Y-%m-%d').date()
+            week_data[week] = total_seconds or 0
+    else:
+        week_data = _weekly_seconds_in_python(start_date, end_date)
     
     # Sort by week and format output
     labels = []
@@ -311,9 +422,10 @@ def weekly_trends():
 
 @analytics_bp.route('/api/analytics/project-efficiency')
 @login_required
+@cached_analytics
 def project_efficiency():
     """Get project efficiency metrics (hours vs billable amount)"""
-    days = int(request.args.get('days', 30))
+    days = _parse_days()
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
     
@@ -364,6 +476,7 @@ def project_efficiency():
 
 @analytics_bp.route('/api/analytics/today-by-task')
 @login_required
+@cached_analytics
 def today_by_task():
     """Get today's total hours grouped by task (includes project-level entries without task).
 
@@ -435,9 +548,10 @@ def today_by_task():
 
 @analytics_bp.route('/api/analytics/summary-with-comparison')
 @login_required
+@cached_analytics
 def summary_with_comparison():
     """Get summary metrics with comparison to previous period"""
-    days = int(request.args.get('days', 30))
+    days = _parse_days()
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
     
@@ -510,9 +624,10 @@ def summary_with_comparison():
 
 @analytics_bp.route('/api/analytics/task-completion')
 @login_required
+@cached_analytics
 def task_completion():
     """Get task completion analytics"""
-    days = int(request.args.get('days', 30))
+    days = _parse_days()
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
     
@@ -590,9 +705,10 @@ def task_completion():
 
 @analytics_bp.route('/api/analytics/revenue-metrics')
 @login_required
+@cached_analytics
 def revenue_metrics():
     """Get revenue and financial metrics"""
-    days = int(request.args.get('days', 30))
+    days = _parse_days()
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
     
@@ -686,9 +802,10 @@ def revenue_metrics():
 
 @analytics_bp.route('/api/analytics/insights')
 @login_required
+@cached_analytics
 def insights():
     """Generate insights and recommendations based on analytics data"""
-    days = int(request.args.get('days', 30))
+    days = _parse_days()
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
     
@@ -0,0 +1,153 @@
+"""Server-side caching of analytics API responses.
+
+Responses are cached per user and normalized query string under data
+versions. A regular user's responses only read their own entries and tasks,
+so they are keyed by that user's version plus a shared version for projects
+and settings. Admin responses span every user and are keyed by an all-users
+version. Committing a change to a model the analytics read bumps the
+versions it affects, so the next dashboard load recomputes instead of
+waiting out the timeout.
+"""
+
+import logging
+import uuid
+from urllib.parse import urlencode
+
+from flask import request
+from flask_login import current_user
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app import cache
+from app.models import Project, Settings, Task, TimeEntry, User
+
+# Bumped by every analytics-relevant change; keys admin responses
+VERSION_KEY = 'analytics/version'
+# Bumped by changes every user's responses can show (project names, currency)
+SHARED_VERSION_KEY = 'analytics/version/shared'
+
+# Models whose changes can alter an analytics response
+_WATCHED = (TimeEntry, Project, Task, User, Settings)
+# User columns no analytics response reads (set on every login)
+_IGNORED_USER_ATTRS = frozenset({'last_login'})
+# Session.info entry: user ids whose data changed, or _SHARED
+_STALE = 'analytics_stale'
+_SHARED = 'shared'
+
+logger = logging.getLogger(__name__)
+
+
+def _user_version_key(user_id):
+    return f'{VERSION_KEY}/user/{user_id}'
+
+
+def _new_version(key):
+    """Store a fresh data version under ``key`` that never expires and return it.
+
+    Versions are random tokens rather than a counter, so a version lost to
+    eviction or a restart can never collide with an older one and revive
+    responses cached under it.
+    """
+    version = uuid.uuid4().hex
+    cache.set(key, version, timeout=0)
+    return version
+
+
+def _versions(*keys):
+    """Current versions for ``keys``, creating any that are missing"""
+    versions = cache.get_many(*keys)
+    return [version if version is not None else _new_version(key)
+            for key, version in zip(keys, versions)]
+
+
+def analytics_cache_key():
+    """Cache key: data versions, user, path and sorted query arguments"""
+    if current_user.is_admin:
+        versions = _versions(VERSION_KEY)
+    else:
+        versions = _versions(SHARED_VERSION_KEY, _user_version_key(current_user.id))
+    args = urlencode(sorted(request.args.items(multi=True)))
+    return f"analytics/{'/'.join(versions)}/{current_user.get_id()}{request.path}?{args}"
+
+
+def cached_analytics(view):
+    """Cache a successful (non-tuple) analytics response for CACHE_DEFAULT_TIMEOUT"""
+    return cache.cached(
+        make_cache_key=lambda *args, **kwargs: analytics_cache_key(),
+        # Error responses are returned as (response, status) tuples
+        response_filter=lambda rv: not isinstance(rv, tuple),
+    )(view)
+
+
+def _owner_ids(state, attr):
+    """Current and previous values of a user-id column of a flushed object"""
+    history = state.attrs[attr].history
+    return {user_id for user_id in (*history.unchanged, *history.added, *history.deleted)
+            if user_id is not None}
+
+
+def _changed_columns(state):
+    return {attr.key for attr in state.mapper.column_attrs
+            if state.attrs[attr.key].history.has_changes()}
+
+
+def _affected_scopes(obj, updated):
+    """The user ids (or _SHARED) whose analytics a change to ``obj`` can alter
+
+    ``updated`` is True for an existing row (as opposed to an insert or
+    delete); those only count when one of their columns changed.
+    """
+    state = inspect(obj)
+    if updated:
+        changed = _changed_columns(state)
+        if isinstance(obj, User):
+            changed -= _IGNORED_USER_ATTRS
+        if not changed:
+            return set()
+    if isinstance(obj, TimeEntry):
+        return _owner_ids(state, 'user_id')
+    if isinstance(obj, Task):
+        return _owner_ids(state, 'assigned_to')
+    if isinstance(obj, User):
+        return {obj.id}
+    return {_SHARED}
+
+
+@event.listens_for(Session, 'after_flush')
+def _flag_flushed_changes(session, flush_context):
+    stale = session.info.setdefault(_STALE, set())
+    for objects, updated in ((session.new, False), (session.dirty, True), (session.deleted, False)):
+        for obj in objects:
+            if isinstance(obj, _WATCHED):
+                stale |= _affected_scopes(obj, updated)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _flag_bulk_changes(orm_execute_state):
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _WATCHED):
+        # The affected rows are unknown, so every user's responses are stale
+        orm_execute_state.session.info.setdefault(_STALE, set()).add(_SHARED)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_version(session):
+    stale = session.info.pop(_STALE, None)
+    if not stale:
+        return
+    keys = [VERSION_KEY]
+    keys.extend(SHARED_VERSION_KEY if scope == _SHARED else _user_version_key(scope)
+                for scope in stale)
+    try:
+        for key in keys:
+            _new_version(key)
+    except Exception:
+        # Cached responses stay live until CACHE_DEFAULT_TIMEOUT
+        logger.exception('Could not invalidate cached analytics responses')
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_changes(session):
+    session.info.pop(_STALE, None)
@@ -232,3 +232,13 @@ def register_cli_commands(app):
                 cur += timedelta(days=1)
         db.session.commit()
         click.echo(f"Recurring generation complete. Created {created} entries.")
+
+    @app.cli.command()
+    @with_appcontext
+    def rebuild_analytics():
+        """Recompute the daily_hours_rollup analytics table from time entries."""
+        from app.utils.daily_hours import rebuild_daily_hours
+        if rebuild_daily_hours():
+            click.echo("Rebuilt daily_hours_rollup")
+        else:
+            click.echo("daily_hours_rollup is not available on this database; run migrations first")
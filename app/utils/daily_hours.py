@@ -0,0 +1,60 @@
+"""Pre-aggregated daily hours for the analytics dashboard.
+
+``daily_hours_rollup`` holds tracked seconds per day, user and project, split
+into billable and non-billable. Triggers on ``time_entries`` keep it current
+(see ``app.models.daily_hours_rollup``), so it never needs a full refresh.
+Until the table exists (migration 020 not run yet) the analytics routes query
+``time_entries`` directly.
+"""
+
+import logging
+import time
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+from app import db
+from app.models.daily_hours_rollup import DailyHoursRollup, REBUILD_SQL
+
+logger = logging.getLogger(__name__)
+
+# Seconds before a database without the rollup table is checked again, so
+# running the migration takes effect without a restart
+RECHECK_SECONDS = 60
+
+# Engine URL -> True once the rollup table was found, or the monotonic time
+# after which a database that lacked it is probed again
+_rollup_available = {}
+
+
+def daily_hours_available():
+    """Return True when analytics can be served from ``daily_hours_rollup``"""
+    key = str(db.engine.url)
+    state = _rollup_available.get(key)
+    if state is True:
+        return True
+    if state is not None and time.monotonic() < state:
+        return False
+    try:
+        # Inspect through the session's connection so the check joins the
+        # current transaction instead of checking out another connection
+        connection = db.session.connection()
+        exists = inspect(connection).has_table(DailyHoursRollup.__tablename__)
+    except SQLAlchemyError:
+        # Transient failure: fall back for this request only, probe again next time
+        logger.warning('Could not check for %s', DailyHoursRollup.__tablename__, exc_info=True)
+        return False
+    _rollup_available[key] = True if exists else time.monotonic() + RECHECK_SECONDS
+    return exists
+
+
+def rebuild_daily_hours():
+    """Recompute the whole rollup from ``time_entries`` (e.g. after a restore)"""
+    if not daily_hours_available():
+        return False
+    dialect = db.session.get_bind().dialect.name
+    if dialect not in REBUILD_SQL:
+        return False
+    db.session.execute(DailyHoursRollup.__table__.delete())
+    db.session.execute(text(REBUILD_SQL[dialect]))
+    db.session.commit()
+    return True
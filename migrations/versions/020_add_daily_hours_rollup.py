@@ -0,0 +1,143 @@
+"""add trigger-maintained daily_hours_rollup table for analytics
+
+Revision ID: 020
+Revises: 019
+Create Date: 2025-10-20 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '020'
+down_revision = '019'
+branch_labels = None
+depends_on = None
+
+
+REBUILD_SQL = {
+    'sqlite': """
+        INSERT INTO daily_hours_rollup (day, user_id, project_id, billable_seconds, nonbillable_seconds)
+        SELECT date(start_time), user_id, project_id,
+               SUM(CASE WHEN billable THEN COALESCE(duration_seconds, 0) ELSE 0 END),
+               SUM(CASE WHEN billable THEN 0 ELSE COALESCE(duration_seconds, 0) END)
+        FROM time_entries
+        WHERE end_time IS NOT NULL
+        GROUP BY date(start_time), user_id, project_id
+    """,
+    'postgresql': """
+        INSERT INTO daily_hours_rollup (day, user_id, project_id, billable_seconds, nonbillable_seconds)
+        SELECT CAST(start_time AS date), user_id, project_id,
+               COALESCE(SUM(duration_seconds) FILTER (WHERE billable), 0),
+               COALESCE(SUM(duration_seconds) FILTER (WHERE NOT billable), 0)
+        FROM time_entries
+        WHERE end_time IS NOT NULL
+        GROUP BY 1, 2, 3
+    """,
+}
+
+SQLITE_SUBTRACT_OLD = """
+    UPDATE daily_hours_rollup
+    SET billable_seconds = billable_seconds - CASE WHEN OLD.billable THEN COALESCE(OLD.duration_seconds, 0) ELSE 0 END,
+        nonbillable_seconds = nonbillable_seconds - CASE WHEN OLD.billable THEN 0 ELSE COALESCE(OLD.duration_seconds, 0) END
+    WHERE OLD.end_time IS NOT NULL
+      AND day = date(OLD.start_time) AND user_id = OLD.user_id AND project_id = OLD.project_id;
+    DELETE FROM daily_hours_rollup
+    WHERE OLD.end_time IS NOT NULL
+      AND day = date(OLD.start_time) AND user_id = OLD.user_id AND project_id = OLD.project_id
+      AND billable_seconds = 0 AND nonbillable_seconds = 0;
+"""
+
+SQLITE_ADD_NEW = """
+    INSERT INTO daily_hours_rollup (day, user_id, project_id, billable_seconds, nonbillable_seconds)
+    SELECT date(NEW.start_time), NEW.user_id, NEW.project_id,
+           CASE WHEN NEW.billable THEN COALESCE(NEW.duration_seconds, 0) ELSE 0 END,
+           CASE WHEN NEW.billable THEN 0 ELSE COALESCE(NEW.duration_seconds, 0) END
+    WHERE NEW.end_time IS NOT NULL
+    ON CONFLICT (day, user_id, project_id) DO UPDATE
+    SET billable_seconds = billable_seconds + excluded.billable_seconds,
+        nonbillable_seconds = nonbillable_seconds + excluded.nonbillable_seconds;
+"""
+
+TRIGGER_SQL = {
+    'sqlite': [
+        "CREATE TRIGGER IF NOT EXISTS trg_time_entries_rollup_insert AFTER INSERT ON time_entries "
+        "BEGIN" + SQLITE_ADD_NEW + "END",
+        "CREATE TRIGGER IF NOT EXISTS trg_time_entries_rollup_update AFTER UPDATE ON time_entries "
+        "BEGIN" + SQLITE_SUBTRACT_OLD + SQLITE_ADD_NEW + "END",
+        "CREATE TRIGGER IF NOT EXISTS trg_time_entries_rollup_delete AFTER DELETE ON time_entries "
+        "BEGIN" + SQLITE_SUBTRACT_OLD + "END",
+    ],
+    'postgresql': [
+        """
+        CREATE OR REPLACE FUNCTION time_entries_rollup_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.end_time IS NOT NULL THEN
+                UPDATE daily_hours_rollup
+                SET billable_seconds = billable_seconds - CASE WHEN OLD.billable THEN COALESCE(OLD.duration_seconds, 0) ELSE 0 END,
+                    nonbillable_seconds = nonbillable_seconds - CASE WHEN OLD.billable THEN 0 ELSE COALESCE(OLD.duration_seconds, 0) END
+                WHERE day = CAST(OLD.start_time AS date) AND user_id = OLD.user_id AND project_id = OLD.project_id;
+                DELETE FROM daily_hours_rollup
+                WHERE day = CAST(OLD.start_time AS date) AND user_id = OLD.user_id AND project_id = OLD.project_id
+                  AND billable_seconds = 0 AND nonbillable_seconds = 0;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.end_time IS NOT NULL THEN
+                INSERT INTO daily_hours_rollup (day, user_id, project_id, billable_seconds, nonbillable_seconds)
+                VALUES (CAST(NEW.start_time AS date), NEW.user_id, NEW.project_id,
+                        CASE WHEN NEW.billable THEN COALESCE(NEW.duration_seconds, 0) ELSE 0 END,
+                        CASE WHEN NEW.billable THEN 0 ELSE COALESCE(NEW.duration_seconds, 0) END)
+                ON CONFLICT (day, user_id, project_id) DO UPDATE
+                SET billable_seconds = daily_hours_rollup.billable_seconds + EXCLUDED.billable_seconds,
+                    nonbillable_seconds = daily_hours_rollup.nonbillable_seconds + EXCLUDED.nonbillable_seconds;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        "DROP TRIGGER IF EXISTS trg_time_entries_rollup ON time_entries",
+        "CREATE TRIGGER trg_time_entries_rollup AFTER INSERT OR UPDATE OR DELETE ON time_entries "
+        "FOR EACH ROW EXECUTE PROCEDURE time_entries_rollup_apply()",
+    ],
+}
+
+
+def upgrade():
+    """Create daily_hours_rollup, fill it, and keep it current with triggers"""
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+
+    inspector = sa.inspect(bind)
+    if 'daily_hours_rollup' not in inspector.get_table_names():
+        op.create_table(
+            'daily_hours_rollup',
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('project_id', sa.Integer(), nullable=False),
+            sa.Column('billable_seconds', sa.BigInteger(), nullable=False, server_default='0'),
+            sa.Column('nonbillable_seconds', sa.BigInteger(), nullable=False, server_default='0'),
+            sa.PrimaryKeyConstraint('day', 'user_id', 'project_id'),
+        )
+
+    if dialect not in TRIGGER_SQL:
+        return
+
+    op.execute(sa.text("DELETE FROM daily_hours_rollup"))
+    op.execute(sa.text(REBUILD_SQL[dialect]))
+    for statement in TRIGGER_SQL[dialect]:
+        op.execute(sa.text(statement))
+
+
+def downgrade():
+    """Drop the triggers and daily_hours_rollup"""
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+
+    if dialect == 'sqlite':
+        for name in ('insert', 'update', 'delete'):
+            op.execute(sa.text(f"DROP TRIGGER IF EXISTS trg_time_entries_rollup_{name}"))
+    elif dialect == 'postgresql':
+        op.execute(sa.text("DROP TRIGGER IF EXISTS trg_time_entries_rollup ON time_entries"))
+        op.execute(sa.text("DROP FUNCTION IF EXISTS time_entries_rollup_apply()"))
+
+    op.drop_table('daily_hours_rollup')
@@ -0,0 +1,48 @@
+"""add composite indexes for per-user and per-project time entry range scans
+
+Revision ID: 021
+Revises: 020
+Create Date: 2025-10-21 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '021'
+down_revision = '020'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ('ix_te_user_start_billable', ['user_id', 'start_time', 'billable']),
+    ('ix_te_project_start', ['project_id', 'start_time']),
+)
+
+
+def upgrade():
+    """Create the indexes (CONCURRENTLY on PostgreSQL so writes are not blocked)"""
+    bind = op.get_bind()
+    existing = {idx['name'] for idx in sa.inspect(bind).get_indexes('time_entries')}
+
+    for name, columns in INDEXES:
+        if name in existing:
+            continue
+        if bind.dialect.name == 'postgresql':
+            # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+            with op.get_context().autocommit_block():
+                op.create_index(name, 'time_entries', columns, postgresql_concurrently=True)
+        else:
+            op.create_index(name, 'time_entries', columns)
+
+
+def downgrade():
+    """Drop the indexes"""
+    bind = op.get_bind()
+    existing = {idx['name'] for idx in sa.inspect(bind).get_indexes('time_entries')}
+
+    for name, _ in INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name='time_entries')
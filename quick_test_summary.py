@@ -2,7 +2,11 @@
 """Quick test summary - runs each test file and shows results"""
 import sys
 import os
+import re
+import json
+import tempfile
 import subprocess
+import importlib.util
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -17,40 +21,66 @@ test_files = [
     "test_timezone.py"
 ]
 
+# Prefer pytest-json-report's machine-readable summary over scraping stdout
+HAS_JSON_REPORT = importlib.util.find_spec("pytest_jsonreport") is not None
+SUMMARY_KEYS = ("passed", "failed", "error", "skipped", "xfailed", "xpassed")
+# Fallback: pytest's final "N passed, M failed in Xs" line (may be colored/framed)
+SUMMARY_RE = re.compile(r'^.*?\d+ (?:passed|failed|errors?)\b.*$', re.IGNORECASE | re.MULTILINE)
+
+
+def read_json_summary(report_file):
+    """Build a pytest-style summary line from a JSON report file"""
+    try:
+        with open(report_file, encoding="utf-8") as f:
+            summary = json.load(f)["summary"]
+    except (OSError, ValueError, KeyError):
+        return ""
+    parts = []
+    for key in SUMMARY_KEYS:
+        count = summary.get(key)
+        if count:
+            # Match pytest's own wording ("1 error", "2 errors")
+            label = f"{key}s" if key == "error" and count != 1 else key
+            parts.append(f"{count} {label}")
+    return ", ".join(parts)
+
+
 print("=" * 80)
 print("TIMETRACKER TEST SUMMARY")
 print("=" * 80)
 
 results = []
+with tempfile.TemporaryDirectory(prefix="timetracker-tests-") as report_dir:
+    for test_file in test_files:
+        print(f"\nTesting: {test_file}...", end=" ", flush=True)
+
+        cmd = [sys.executable, "-m", "pytest", f"tests/{test_file}", "-q", "--tb=no", "--no-header",
+               "-p", "no:cacheprovider"]
 
-for test_file in test_files:
-    print(f"\nTesting: {test_file}...", end=" ", flush=True)
-    
-    cmd = [sys.executable, "-m", "pytest", f"tests/{test_file}", "-q", "--tb=no", "--no-header"]
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-    
-    # Parse output for pass/fail counts
-    output = result.stdout + result.stderr
-    
-    if result.returncode == 0:
-        status = "✓ ALL PASSED"
-    elif result.returncode == 1:
-        status = "✗ SOME FAILED"
-    else:
-        status = "⚠ ERROR"
-    
-    # Try to extract summary line
-    summary_line = ""
-    for line in output.split('\n'):
-        if 'passed' in line.lower() or 'failed' in line.lower() or 'error' in line.lower():
-            summary_line = line.strip()
-            if summary_line:
-                break
-    
-    results.append((test_file, status, summary_line))
-    print(f"{status}")
-    if summary_line:
-        print(f"  └─ {summary_line}")
+        if HAS_JSON_REPORT:
+            report_file = os.path.join(report_dir, f"{test_file}.json")
+            cmd += ["--json-report", f"--json-report-file={report_file}"]
+            # Child output is not needed; the report file carries the counts
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30)
+            summary_line = read_json_summary(report_file)
+        else:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+
+            # Extract the summary line from the output in a single regex scan
+            match = SUMMARY_RE.search(result.stdout) or SUMMARY_RE.search(result.stderr)
+            summary_line = match.group(0).strip() if match else ""
+
+        if result.returncode == 0:
+            status = "✓ ALL PASSED"
+        elif result.returncode == 1:
+            status = "✗ SOME FAILED"
+        else:
+            status = "⚠ ERROR"
+
+        results.append((test_file, status, summary_line))
+        print(f"{status}")
+        if summary_line:
+            print(f"  └─ {summary_line}")
 
 print("\n" + "=" * 80)
 print("FINAL SUMMARY")
@@ -60,4 +90,3 @@ for test_file, status, summary in results:
     print(f"{status:15} {test_file}")
 
 print("=" * 80)
-
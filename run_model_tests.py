@@ -3,18 +3,18 @@
 import subprocess
 import sys
 
-result = subprocess.run(
-    [sys.executable, "-m", "pytest", "-m", "unit and models", "-v", "--tb=short"],
-    capture_output=True,
-    text=True
-)
-
+# Stream pytest output straight into the results file instead of buffering it
 with open("test_results_model.txt", "w", encoding="utf-8") as f:
-    f.write(result.stdout)
-    f.write("\n")
-    f.write(result.stderr)
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "-m", "unit and models", "-q", "--tb=line", "--no-header",
+         "-o", "console_output_style=classic", "-n", "auto",
+         "-p", "no:cacheprovider"],
+        stdout=f,
+        stderr=subprocess.STDOUT
+    )
+
+with open("test_results_model.txt", "a", encoding="utf-8") as f:
     f.write(f"\n\nExit code: {result.returncode}\n")
 
 print("Test results written to test_results_model.txt")
 print(f"Exit code: {result.returncode}")
-
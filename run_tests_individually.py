@@ -32,7 +32,8 @@ for test_file in test_files:
         str(test_file),
         "-v",
         "--tb=line",
-        "-x"  # Stop on first failure
+        "-x",  # Stop on first failure
+        "-p", "no:cacheprovider"  # One-off run, skip .pytest_cache I/O
     ]
     
     result = subprocess.run(cmd, capture_output=False, text=True)
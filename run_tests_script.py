@@ -20,7 +20,8 @@ if __name__ == "__main__":
         "-v",
         "--tb=short",
         "-ra",
-        "--color=no"
+        "--color=no",
+        "-p", "no:cacheprovider"
     ])
     
     print()
@@ -6,87 +6,156 @@ Generates changelogs from git commits and GitHub issues/PRs
 
 import os
 import sys
+import asyncio
 import subprocess
 import argparse
+import functools
+import importlib.util
+import itertools
 import re
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import requests
 
+try:
+    import httpx
+except ImportError:  # Optional: without it REST lookups run one at a time
+    httpx = None
+
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+@functools.lru_cache(maxsize=4)
+def _discover_repo_url(repo_path: str) -> Optional[str]:
+    """Get GitHub repository URL from git remote (cached per repository)"""
+    try:
+        result = subprocess.run(
+            ['git', 'remote', 'get-url', 'origin'],
+            cwd=repo_path,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode == 0:
+            url = result.stdout.strip()
+            # Convert SSH URL to HTTPS if needed
+            if url.startswith('git@github.com:'):
+                url = url.replace('git@github.com:', 'https://github.com/')
+            if url.endswith('.git'):
+                url = url[:-4]
+            return url
+    except Exception as e:
+        print(f"Warning: Could not get repository URL: {e}")
+    return None
+
+
+@functools.lru_cache(maxsize=4)
+def _discover_latest_tag(repo_path: str) -> Optional[str]:
+    """Get the latest git tag reachable from HEAD (cached per repository)"""
+    try:
+        result = subprocess.run(
+            ['git', 'describe', '--tags', '--abbrev=0'],
+            cwd=repo_path,
+            capture_output=True,
+            text=True
+        )
+    except OSError as e:
+        print(f"Warning: Could not get latest tag: {e}")
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
 class ChangelogGenerator:
+    # Patterns for categorization (matched against the lower-cased subject)
+    CATEGORY_PATTERNS = {
+        'Features': [r'^feat(\(.+\))?:', r'^add:', r'^implement:', r'^new:'],
+        'Bug Fixes': [r'^fix(\(.+\))?:', r'^bug:', r'^hotfix:', r'^patch:'],
+        'Improvements': [r'^improve:', r'^enhance:', r'^update:', r'^upgrade:'],
+        'Documentation': [r'^docs?(\(.+\))?:', r'^readme:', r'^doc:'],
+        'Refactoring': [r'^refactor(\(.+\))?:', r'^cleanup:', r'^reorganize:'],
+        'Dependencies': [r'^deps?(\(.+\))?:', r'^bump:', r'^requirements:'],
+        'Database': [r'^db:', r'^migration:', r'^schema:', r'^alembic:'],
+        'Docker': [r'^docker:', r'^dockerfile:', r'^compose:'],
+        'CI/CD': [r'^ci:', r'^cd:', r'^workflow:', r'^action:', r'^build:']
+    }
+    # All category patterns as one alternation; group cN is the Nth category,
+    # so the first matching category wins just like the ordered pattern lists
+    _CATEGORY_NAMES = list(CATEGORY_PATTERNS)
+    _CATEGORY_RE = re.compile('|'.join(
+        f"(?P<c{index}>{'|'.join(patterns)})"
+        for index, patterns in enumerate(CATEGORY_PATTERNS.values())
+    ))
+    
+    # Conventional-commit prefixes stripped from subjects when formatting
+    _CLEAN_FEAT = re.compile(r'^(feat|fix|improve|enhance|update)(\(.+\))?:\s*', re.IGNORECASE)
+    _CLEAN_TECH = re.compile(r'^(db|docker|ci|cd|refactor|deps?)(\(.+\))?:\s*', re.IGNORECASE)
+    _CLEAN_DOCS = re.compile(r'^docs?(\(.+\))?:\s*', re.IGNORECASE)
+    
     def __init__(self, repo_path: str = "."):
         self.repo_path = repo_path
         self.github_token = os.getenv('GITHUB_TOKEN')
-        self.repo_url = self._get_repo_url()
+        self.repo_url = _discover_repo_url(os.path.abspath(repo_path))
         
-    def _get_repo_url(self) -> Optional[str]:
-        """Get GitHub repository URL from git remote"""
-        try:
-            result = subprocess.run(
-                ['git', 'remote', 'get-url', 'origin'],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                url = result.stdout.strip()
-                # Convert SSH URL to HTTPS if needed
-                if url.startswith('git@github.com:'):
-                    url = url.replace('git@github.com:', 'https://github.com/')
-                if url.endswith('.git'):
-                    url = url[:-4]
-                return url
-        except Exception as e:
-            print(f"Warning: Could not get repository URL: {e}")
-        return None
-    
-    def _run_git_command(self, command: List[str]) -> str:
-        """Run a git command and return output"""
+    def _stream_git_command(self, command: List[str], separator: bytes = b'\x00') -> Iterator[str]:
+        """Run a git command and yield its output one record at a time.
+
+        Records are split on ``separator`` as they arrive from the pipe, so the
+        full output is never held in memory as a single string.
+        """
+        process = subprocess.Popen(
+            ['git'] + command,
+            cwd=self.repo_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=1024 * 1024
+        )
+        pending = b''
         try:
-            result = subprocess.run(
-                ['git'] + command,
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return result.stdout.strip()
-        except subprocess.CalledProcessError as e:
-            print(f"Git command failed: {e}")
-            return ""
+            for chunk in iter(lambda: process.stdout.read(64 * 1024), b''):
+                pending += chunk
+                *records, pending = pending.split(separator)
+                for record in records:
+                    yield record.decode('utf-8', errors='replace')
+            if pending:
+                yield pending.decode('utf-8', errors='replace')
+        finally:
+            process.stdout.close()
+            returncode = process.wait()
+            if returncode != 0:
+                print(f"Git command failed: git {' '.join(command)} (exit code {returncode})")
     
     def get_latest_tag(self) -> str:
         """Get the latest git tag"""
-        output = self._run_git_command(['describe', '--tags', '--abbrev=0'])
-        return output if output else "HEAD~50"  # Fallback to last 50 commits
+        tag = _discover_latest_tag(os.path.abspath(self.repo_path))
+        return tag if tag else "HEAD~50"  # Fallback to last 50 commits
     
-    def get_commits_since_tag(self, since_tag: str) -> List[Dict[str, str]]:
-        """Get commits since the specified tag"""
+    def _get_log_range(self, since_tag: str) -> List[str]:
+        """Get the git log arguments selecting commits since the specified tag"""
         if since_tag == "HEAD~50":
-            command = ['log', '--pretty=format:%H|%s|%an|%ad|%b', '--date=short', '-50']
-        else:
-            command = ['log', f'{since_tag}..HEAD', '--pretty=format:%H|%s|%an|%ad|%b', '--date=short']
-        
-        output = self._run_git_command(command)
-        commits = []
-        
-        if output:
-            for line in output.split('\n'):
-                if '|' in line:
-                    parts = line.split('|', 4)
-                    if len(parts) >= 4:
-                        commits.append({
-                            'hash': parts[0][:8],
-                            'subject': parts[1],
-                            'author': parts[2],
-                            'date': parts[3],
-                            'body': parts[4] if len(parts) > 4 else ''
-                        })
-        
-        return commits
+            return ['-50']
+        return [f'{since_tag}..HEAD']
     
-    def categorize_commits(self, commits: List[Dict[str, str]]) -> Dict[str, List[Dict[str, str]]]:
-        """Categorize commits by type"""
+    def get_commits_since_tag(self, since_tag: str) -> Iterator[Dict[str, str]]:
+        """Yield commits since the specified tag"""
+        # NUL-terminated records (-z) with unit-separated fields, so multi-line
+        # bodies and '|' in subjects survive parsing intact
+        log_format = '--pretty=format:%H%x1f%s%x1f%an%x1f%ad%x1f%b'
+        command = ['log', '-z', *self._get_log_range(since_tag), log_format, '--date=short']
+        
+        for record in self._stream_git_command(command):
+            parts = record.split('\x1f', 4)
+            if len(parts) >= 4:
+                yield {
+                    'hash': parts[0].strip()[:8],
+                    'subject': parts[1],
+                    'author': parts[2],
+                    'date': parts[3],
+                    'body': parts[4].strip() if len(parts) > 4 else ''
+                }
+    
+    def _scan_commits(
+        self, 
+        commits: Iterable[Dict[str, str]]
+    ) -> Tuple[Dict[str, List[Dict[str, str]]], List[Dict[str, str]]]:
+        """Categorize commits by type and collect breaking changes in one pass"""
         categories = {
             'Features': [],
             'Bug Fixes': [],
@@ -99,51 +168,147 @@ class ChangelogGenerator:
             'CI/CD': [],
             'Other': []
         }
-        
-        # Patterns for categorization
-        patterns = {
-            'Features': [r'^feat(\(.+\))?:', r'^add:', r'^implement:', r'^new:'],
-            'Bug Fixes': [r'^fix(\(.+\))?:', r'^bug:', r'^hotfix:', r'^patch:'],
-            'Improvements': [r'^improve:', r'^enhance:', r'^update:', r'^upgrade:'],
-            'Documentation': [r'^docs?(\(.+\))?:', r'^readme:', r'^doc:'],
-            'Refactoring': [r'^refactor(\(.+\))?:', r'^cleanup:', r'^reorganize:'],
-            'Dependencies': [r'^deps?(\(.+\))?:', r'^bump:', r'^requirements:'],
-            'Database': [r'^db:', r'^migration:', r'^schema:', r'^alembic:'],
-            'Docker': [r'^docker:', r'^dockerfile:', r'^compose:'],
-            'CI/CD': [r'^ci:', r'^cd:', r'^workflow:', r'^action:', r'^build:']
-        }
+        breaking_changes = []
         
         for commit in commits:
             subject = commit['subject'].lower()
-            categorized = False
             
-            for category, category_patterns in patterns.items():
-                for pattern in category_patterns:
-                    if re.match(pattern, subject):
-                        categories[category].append(commit)
-                        categorized = True
-                        break
-                if categorized:
-                    break
+            # Look for BREAKING CHANGE in commit message
+            if ('BREAKING CHANGE' in commit['subject'] or 'BREAKING CHANGE' in commit['body']
+                    or 'breaking:' in subject):
+                breaking_changes.append(commit)
             
-            if not categorized:
+            match = self._CATEGORY_RE.match(subject)
+            if match:
+                categories[self._CATEGORY_NAMES[int(match.lastgroup[1:])]].append(commit)
+            else:
                 categories['Other'].append(commit)
         
-        return categories
+        return categories, breaking_changes
     
-    def extract_breaking_changes(self, commits: List[Dict[str, str]]) -> List[Dict[str, str]]:
-        """Extract breaking changes from commits"""
-        breaking_changes = []
+    def _fetch_github_refs_graphql(
+        self, owner: str, repo: str, numbers: Iterable[str]
+    ) -> Optional[Tuple[List[Dict], List[Dict]]]:
+        """Fetch PRs and issues in a single GitHub GraphQL round-trip.
+
+        Returns None when the query fails (e.g. the token lacks GraphQL
+        access) so the caller can fall back to the REST API.
+        """
+        numbers = sorted(numbers, key=int)
+        fields = 'title url author { login }'
+        subqueries = ' '.join(
+            f'n{number}: issueOrPullRequest(number: {number}) {{ __typename '
+            f'... on PullRequest {{ {fields} }} ... on Issue {{ {fields} }} }}'
+            for number in numbers
+        )
+        query = f'query($owner: String!, $name: String!) {{ repository(owner: $owner, name: $name) {{ {subqueries} }} }}'
         
-        for commit in commits:
-            # Look for BREAKING CHANGE in commit message
-            full_message = f"{commit['subject']} {commit['body']}"
-            if 'BREAKING CHANGE' in full_message or 'breaking:' in commit['subject'].lower():
-                breaking_changes.append(commit)
+        try:
+            response = requests.post(
+                'https://api.github.com/graphql',
+                json={'query': query, 'variables': {'owner': owner, 'name': repo}},
+                headers={'Authorization': f'bearer {self.github_token}'}
+            )
+            if response.status_code != 200:
+                return None
+            repository = (response.json().get('data') or {}).get('repository')
+        except Exception as e:
+            print(f"Warning: GitHub GraphQL query failed: {e}")
+            return None
+        if repository is None:
+            return None
+        
+        prs = []
+        issues = []
+        for number in numbers:
+            node = repository.get(f'n{number}')
+            if not node:
+                continue
+            entry = {
+                'number': number,
+                'title': node['title'],
+                'url': node['url'],
+                'author': (node.get('author') or {}).get('login', 'ghost')
+            }
+            if node['__typename'] == 'PullRequest':
+                prs.append(entry)
+            else:
+                issues.append(entry)
+        return prs, issues
+    
+    def _fetch_github_refs_rest(
+        self, owner: str, repo: str, numbers: Iterable[str]
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """Fetch PRs and issues one by one from the GitHub REST API"""
+        prs = []
+        issues = []
+        headers = {'Authorization': f'token {self.github_token}'}
+        
+        for number in numbers:
+            try:
+                # Try to fetch as PR first
+                pr_url = f'https://api.github.com/repos/{owner}/{repo}/pulls/{number}'
+                response = requests.get(pr_url, headers=headers)
+                
+                if response.status_code == 200:
+                    pr_data = response.json()
+                    prs.append({
+                        'number': number,
+                        'title': pr_data['title'],
+                        'url': pr_data['html_url'],
+                        'author': pr_data['user']['login']
+                    })
+                else:
+                    # Try as issue
+                    issue_url = f'https://api.github.com/repos/{owner}/{repo}/issues/{number}'
+                    response = requests.get(issue_url, headers=headers)
+                    
+                    if response.status_code == 200:
+                        issue_data = response.json()
+                        issues.append({
+                            'number': number,
+                            'title': issue_data['title'],
+                            'url': issue_data['html_url'],
+                            'author': issue_data['user']['login']
+                        })
+            
+            except Exception as e:
+                print(f"Warning: Could not fetch GitHub data for #{number}: {e}")
         
-        return breaking_changes
+        return prs, issues
+    
+    async def _fetch_github_refs_rest_async(
+        self, owner: str, repo: str, numbers: Iterable[str]
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """Fetch PRs and issues concurrently from the GitHub REST API"""
+        numbers = sorted(numbers, key=int)
+        headers = {'Authorization': f'token {self.github_token}'}
+        
+        async def fetch(client, number: str) -> Tuple[Optional[str], Optional[Dict]]:
+            try:
+                # Try to fetch as PR first, then as issue
+                for kind, path in (('pr', 'pulls'), ('issue', 'issues')):
+                    response = await client.get(f'https://api.github.com/repos/{owner}/{repo}/{path}/{number}')
+                    if response.status_code == 200:
+                        data = response.json()
+                        return kind, {
+                            'number': number,
+                            'title': data['title'],
+                            'url': data['html_url'],
+                            'author': data['user']['login']
+                        }
+            except Exception as e:
+                print(f"Warning: Could not fetch GitHub data for #{number}: {e}")
+            return None, None
+        
+        async with httpx.AsyncClient(http2=HTTP2_AVAILABLE, headers=headers, timeout=30) as client:
+            results = await asyncio.gather(*(fetch(client, number) for number in numbers))
+        
+        prs = [entry for kind, entry in results if kind == 'pr']
+        issues = [entry for kind, entry in results if kind == 'issue']
+        return prs, issues
     
-    def get_github_prs_and_issues(self, commits: List[Dict[str, str]]) -> Dict[str, List[Dict]]:
+    async def get_github_prs_and_issues(self, commits: Iterable[Dict[str, str]]) -> Dict[str, List[Dict]]:
         """Get GitHub PRs and issues mentioned in commits"""
         prs = []
         issues = []
@@ -159,68 +324,43 @@ class ChangelogGenerator:
             matches = re.findall(pr_pattern, f"{commit['subject']} {commit['body']}")
             mentioned_numbers.update(matches)
         
+        if not mentioned_numbers:
+            return {'prs': prs, 'issues': issues}
+        
         # Fetch details from GitHub API
         repo_parts = self.repo_url.replace('https://github.com/', '').split('/')
         if len(repo_parts) >= 2:
             owner, repo = repo_parts[0], repo_parts[1]
             
-            headers = {'Authorization': f'token {self.github_token}'}
-            
-            for number in mentioned_numbers:
-                try:
-                    # Try to fetch as PR first
-                    pr_url = f'https://api.github.com/repos/{owner}/{repo}/pulls/{number}'
-                    response = requests.get(pr_url, headers=headers)
-                    
-                    if response.status_code == 200:
-                        pr_data = response.json()
-                        prs.append({
-                            'number': number,
-                            'title': pr_data['title'],
-                            'url': pr_data['html_url'],
-                            'author': pr_data['user']['login']
-                        })
-                    else:
-                        # Try as issue
-                        issue_url = f'https://api.github.com/repos/{owner}/{repo}/issues/{number}'
-                        response = requests.get(issue_url, headers=headers)
-                        
-                        if response.status_code == 200:
-                            issue_data = response.json()
-                            issues.append({
-                                'number': number,
-                                'title': issue_data['title'],
-                                'url': issue_data['html_url'],
-                                'author': issue_data['user']['login']
-                            })
-                
-                except Exception as e:
-                    print(f"Warning: Could not fetch GitHub data for #{number}: {e}")
+            result = self._fetch_github_refs_graphql(owner, repo, mentioned_numbers)
+            if result is None:
+                if httpx is not None:
+                    result = await self._fetch_github_refs_rest_async(owner, repo, mentioned_numbers)
+                else:
+                    result = self._fetch_github_refs_rest(owner, repo, mentioned_numbers)
+            prs, issues = result
         
         return {'prs': prs, 'issues': issues}
     
-    def generate_changelog(self, version: str, since_tag: str = None) -> str:
+    async def generate_changelog(self, version: str, since_tag: str = None) -> str:
         """Generate complete changelog"""
         if not since_tag:
             since_tag = self.get_latest_tag()
         
         print(f"Generating changelog for version {version} since {since_tag}...")
         
-        # Get commits
-        commits = self.get_commits_since_tag(since_tag)
-        print(f"Found {len(commits)} commits")
+        # Categorize commits and extract breaking changes as they stream in
+        categorized, breaking_changes = self._scan_commits(self.get_commits_since_tag(since_tag))
+        commit_count = sum(len(commits) for commits in categorized.values())
+        print(f"Found {commit_count} commits")
         
-        if not commits:
+        if not commit_count:
             return f"# {version}\n\n*No changes since {since_tag}*\n"
         
-        # Categorize commits
-        categorized = self.categorize_commits(commits)
-        
-        # Extract breaking changes
-        breaking_changes = self.extract_breaking_changes(commits)
-        
         # Get GitHub data
-        github_data = self.get_github_prs_and_issues(commits)
+        github_data = await self.get_github_prs_and_issues(
+            itertools.chain.from_iterable(categorized.values())
+        )
         
         # Generate changelog content
         changelog = self._format_changelog(
@@ -229,6 +369,12 @@ class ChangelogGenerator:
         
         return changelog
     
+    def _format_commit_link(self, commit: Dict[str, str]) -> str:
+        """Format the short-hash reference for a commit, linked when possible"""
+        if self.repo_url:
+            return f"([{commit['hash']}]({self.repo_url}/commit/{commit['hash']}))"
+        return f"([{commit['hash']}])"
+    
     def _format_changelog(
         self, 
         version: str, 
@@ -239,97 +385,77 @@ class ChangelogGenerator:
     ) -> str:
         """Format the changelog content"""
         
-        changelog = f"# {version}\n\n"
-        changelog += f"*Released on {datetime.now().strftime('%Y-%m-%d')}*\n\n"
+        parts: List[str] = [f"# {version}\n\n"]
+        parts.append(f"*Released on {datetime.now().strftime('%Y-%m-%d')}*\n\n")
         
         # Summary
         total_commits = sum(len(commits) for commits in categorized.values())
-        changelog += f"**{total_commits} changes** since {since_tag}\n\n"
+        parts.append(f"**{total_commits} changes** since {since_tag}\n\n")
         
         # Breaking changes (if any)
         if breaking_changes:
-            changelog += "## ⚠️ Breaking Changes\n\n"
+            parts.append("## ⚠️ Breaking Changes\n\n")
             for commit in breaking_changes:
-                changelog += f"- {commit['subject']} ([{commit['hash']}]"
-                if self.repo_url:
-                    changelog += f"({self.repo_url}/commit/{commit['hash']}))\n"
-                else:
-                    changelog += ")\n"
-            changelog += "\n"
+                parts.append(f"- {commit['subject']} {self._format_commit_link(commit)}\n")
+            parts.append("\n")
         
         # Features and improvements
         feature_categories = ['Features', 'Improvements', 'Bug Fixes']
         for category in feature_categories:
             if categorized[category]:
                 icon = {'Features': '✨', 'Improvements': '🚀', 'Bug Fixes': '🐛'}[category]
-                changelog += f"## {icon} {category}\n\n"
+                parts.append(f"## {icon} {category}\n\n")
                 
                 for commit in categorized[category]:
                     # Clean up commit subject
-                    subject = re.sub(r'^(feat|fix|improve|enhance|update)(\(.+\))?:\s*', '', commit['subject'], flags=re.IGNORECASE)
-                    changelog += f"- {subject} ([{commit['hash']}]"
-                    if self.repo_url:
-                        changelog += f"({self.repo_url}/commit/{commit['hash']}))\n"
-                    else:
-                        changelog += ")\n"
-                changelog += "\n"
+                    subject = self._CLEAN_FEAT.sub('', commit['subject'])
+                    parts.append(f"- {subject} {self._format_commit_link(commit)}\n")
+                parts.append("\n")
         
         # Technical changes
         tech_categories = ['Database', 'Docker', 'CI/CD', 'Refactoring', 'Dependencies']
         tech_changes = any(categorized[cat] for cat in tech_categories)
         
         if tech_changes:
-            changelog += "## 🔧 Technical Changes\n\n"
+            parts.append("## 🔧 Technical Changes\n\n")
             for category in tech_categories:
                 if categorized[category]:
-                    changelog += f"### {category}\n"
+                    parts.append(f"### {category}\n")
                     for commit in categorized[category]:
-                        subject = re.sub(r'^(db|docker|ci|cd|refactor|deps?)(\(.+\))?:\s*', '', commit['subject'], flags=re.IGNORECASE)
-                        changelog += f"- {subject} ([{commit['hash']}]"
-                        if self.repo_url:
-                            changelog += f"({self.repo_url}/commit/{commit['hash']}))\n"
-                        else:
-                            changelog += ")\n"
-                    changelog += "\n"
+                        subject = self._CLEAN_TECH.sub('', commit['subject'])
+                        parts.append(f"- {subject} {self._format_commit_link(commit)}\n")
+                    parts.append("\n")
         
         # Documentation
         if categorized['Documentation']:
-            changelog += "## 📚 Documentation\n\n"
+            parts.append("## 📚 Documentation\n\n")
             for commit in categorized['Documentation']:
-                subject = re.sub(r'^docs?(\(.+\))?:\s*', '', commit['subject'], flags=re.IGNORECASE)
-                changelog += f"- {subject} ([{commit['hash']}]"
-                if self.repo_url:
-                    changelog += f"({self.repo_url}/commit/{commit['hash']}))\n"
-                else:
-                    changelog += ")\n"
-            changelog += "\n"
+                subject = self._CLEAN_DOCS.sub('', commit['subject'])
+                parts.append(f"- {subject} {self._format_commit_link(commit)}\n")
+            parts.append("\n")
         
         # Other changes
         if categorized['Other']:
-            changelog += "## 📋 Other Changes\n\n"
+            parts.append("## 📋 Other Changes\n\n")
             for commit in categorized['Other']:
-                changelog += f"- {commit['subject']} ([{commit['hash']}]"
-                if self.repo_url:
-                    changelog += f"({self.repo_url}/commit/{commit['hash']}))\n"
-                else:
-                    changelog += ")\n"
-            changelog += "\n"
+                parts.append(f"- {commit['subject']} {self._format_commit_link(commit)}\n")
+            parts.append("\n")
         
         # GitHub PRs and Issues
         if github_data['prs'] or github_data['issues']:
-            changelog += "## 🔗 Related\n\n"
+            parts.append("## 🔗 Related\n\n")
             
             if github_data['prs']:
-                changelog += "**Pull Requests:**\n"
+                parts.append("**Pull Requests:**\n")
                 for pr in github_data['prs']:
-                    changelog += f"- [{pr['title']}]({pr['url']}) by @{pr['author']}\n"
-                changelog += "\n"
+                    parts.append(f"- [{pr['title']}]({pr['url']}) by @{pr['author']}\n")
+                parts.append("\n")
             
             if github_data['issues']:
-                changelog += "**Issues:**\n"
+                parts.append("**Issues:**\n")
                 for issue in github_data['issues']:
-                    changelog += f"- [{issue['title']}]({issue['url']}) by @{issue['author']}\n"
-                changelog += "\n"
+                    parts.append(f"- [{issue['title']}]({issue['url']}) by @{issue['author']}\n")
+                parts.append("\n")
         
         # Contributors
         contributors = set()
@@ -338,10 +464,10 @@ class ChangelogGenerator:
                 contributors.add(commit['author'])
         
         if contributors:
-            changelog += "## 👥 Contributors\n\n"
-            changelog += f"Thanks to all contributors: {', '.join(f'@{c}' for c in sorted(contributors))}\n\n"
+            parts.append("## 👥 Contributors\n\n")
+            parts.append(f"Thanks to all contributors: {', '.join(f'@{c}' for c in sorted(contributors))}\n\n")
         
-        return changelog
+        return ''.join(parts)
 
 def main():
     parser = argparse.ArgumentParser(description='Generate changelog for TimeTracker')
@@ -354,19 +480,17 @@ def main():
     args = parser.parse_args()
     
     generator = ChangelogGenerator(args.repo_path)
-    changelog = generator.generate_changelog(args.version, args.since)
+    changelog = asyncio.run(generator.generate_changelog(args.version, args.since))
     
     if args.output:
         output_file = args.output
     else:
         output_file = os.path.join(args.repo_path, 'CHANGELOG.md')
     
-    # Write changelog
-    mode = 'a' if args.append else 'w'
-    with open(output_file, mode, encoding='utf-8') as f:
-        if args.append and os.path.exists(output_file):
-            f.write('\n\n---\n\n')
-        f.write(changelog)
+    # Write changelog as UTF-8 bytes in one buffered write (no newline translation)
+    separator = b'\n\n---\n\n' if args.append and os.path.exists(output_file) else b''
+    with open(output_file, 'ab' if args.append else 'wb', buffering=1 << 20) as f:
+        f.write(separator + changelog.encode('utf-8'))
     
     print(f"Changelog written to {output_file}")
     
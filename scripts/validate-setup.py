@@ -4,53 +4,85 @@ TimeTracker CI/CD Setup Validation Script
 Validates that all CI/CD components are properly configured
 """
 
+import functools
+import importlib.util
+import io
 import os
 import sys
-import subprocess
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
 
 
-class Colors:
-    """ANSI color codes for terminal output"""
-    GREEN = '\033[92m'
-    RED = '\033[91m'
-    YELLOW = '\033[93m'
-    BLUE = '\033[94m'
-    ENDC = '\033[0m'
-    BOLD = '\033[1m'
+# ANSI color codes for terminal output (disabled when piped or NO_COLOR is set)
+_USE_COLOR = sys.stdout.isatty() and os.environ.get('NO_COLOR') is None
+
+GREEN = '\033[92m' if _USE_COLOR else ''
+RED = '\033[91m' if _USE_COLOR else ''
+YELLOW = '\033[93m' if _USE_COLOR else ''
+BLUE = '\033[94m' if _USE_COLOR else ''
+ENDC = '\033[0m' if _USE_COLOR else ''
+BOLD = '\033[1m' if _USE_COLOR else ''
+
+
+# Output is queued and written once per section instead of once per line
+_output = []
+
+
+def emit(text=''):
+    """Queue a line of output"""
+    _output.append(text)
+
+
+def flush_output():
+    """Write all queued output with a single stdout write"""
+    if _output:
+        sys.stdout.write('\n'.join(_output) + '\n')
+        sys.stdout.flush()
+        _output.clear()
 
 
 def print_header(text):
-    """Print a formatted header"""
-    print(f"\n{Colors.BOLD}{Colors.BLUE}{'=' * 60}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{text:^60}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{'=' * 60}{Colors.ENDC}\n")
+    """Print a formatted header (starting a new output section)"""
+    flush_output()
+    emit(f"\n{BOLD}{BLUE}{'=' * 60}{ENDC}")
+    emit(f"{BOLD}{BLUE}{text:^60}{ENDC}")
+    emit(f"{BOLD}{BLUE}{'=' * 60}{ENDC}\n")
 
 
 def print_success(text):
     """Print success message"""
-    print(f"{Colors.GREEN}✓{Colors.ENDC} {text}")
+    emit(f"{GREEN}✓{ENDC} {text}")
 
 
 def print_error(text):
     """Print error message"""
-    print(f"{Colors.RED}✗{Colors.ENDC} {text}")
+    emit(f"{RED}✗{ENDC} {text}")
 
 
 def print_warning(text):
     """Print warning message"""
-    print(f"{Colors.YELLOW}⚠{Colors.ENDC} {text}")
+    emit(f"{YELLOW}⚠{ENDC} {text}")
 
 
 def print_info(text):
     """Print info message"""
-    print(f"{Colors.BLUE}ℹ{Colors.ENDC} {text}")
+    emit(f"{BLUE}ℹ{ENDC} {text}")
+
+
+@functools.lru_cache(maxsize=None)
+def _list_directory(dirpath):
+    """Return the entry names of a directory, scanning it only once"""
+    try:
+        with os.scandir(dirpath) as entries:
+            return frozenset(entry.name for entry in entries)
+    except OSError:
+        return frozenset()
 
 
 def check_file_exists(filepath, required=True):
     """Check if a file exists"""
     path = Path(filepath)
-    if path.exists():
+    if path.name in _list_directory(str(path.parent)):
         print_success(f"Found: {filepath}")
         return True
     else:
@@ -62,40 +94,42 @@ def check_file_exists(filepath, required=True):
 
 
 def check_python_package(package_name):
-    """Check if a Python package is installed"""
-    try:
-        __import__(package_name)
+    """Check if a Python package is installed (without importing it)"""
+    if importlib.util.find_spec(package_name) is not None:
         print_success(f"Python package '{package_name}' is installed")
         return True
-    except ImportError:
-        print_error(f"Python package '{package_name}' is NOT installed")
-        return False
+    print_error(f"Python package '{package_name}' is NOT installed")
+    return False
 
 
-def run_command(command, description):
-    """Run a command and check if it succeeds"""
-    try:
-        result = subprocess.run(
-            command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        if result.returncode == 0:
-            print_success(f"{description}: OK")
-            return True
-        else:
-            print_error(f"{description}: FAILED")
-            if result.stderr:
-                print(f"  Error: {result.stderr[:200]}")
-            return False
-    except subprocess.TimeoutExpired:
-        print_error(f"{description}: TIMEOUT")
-        return False
-    except Exception as e:
-        print_error(f"{description}: ERROR ({str(e)})")
-        return False
+class _CollectionRecorder:
+    """pytest plugin that keeps the collected test items"""
+
+    def __init__(self):
+        self.items = []
+
+    def pytest_collection_modifyitems(self, items):
+        self.items = list(items)
+
+
+def collect_tests():
+    """Collect the test suite once, in-process
+
+    Returns an (exit_code, total_tests, smoke_tests, output) tuple. Collecting
+    in-process avoids paying interpreter and plugin start-up for every check.
+    """
+    import pytest
+
+    # Same import path as `python -m pytest` run from the project root
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+
+    recorder = _CollectionRecorder()
+    output = io.StringIO()
+    with redirect_stdout(output), redirect_stderr(output):
+        exit_code = pytest.main(['--collect-only', '-q', '-p', 'no:cacheprovider'], plugins=[recorder])
+    smoke = sum(1 for item in recorder.items if item.get_closest_marker('smoke'))
+    return int(exit_code), len(recorder.items), smoke, output.getvalue()
 
 
 def main():
@@ -187,7 +221,7 @@ def main():
     
     test_deps_ok = True
     for package in test_packages:
-        if not check_python_package(package.replace('_', '-')):
+        if not check_python_package(package):
             test_deps_ok = False
     
     if not test_deps_ok:
@@ -196,13 +230,25 @@ def main():
     # 7. Run quick tests
     print_header("7. Quick Test Validation")
     
-    # Check if pytest can discover tests
-    if run_command('pytest --collect-only -q', 'Test discovery'):
-        print_info("Tests can be discovered successfully")
-    
-    # Try to run smoke tests (if they exist)
-    if run_command('pytest -m smoke --co -q', 'Smoke test discovery'):
-        print_info("Smoke tests are properly marked")
+    # Discover all tests and the smoke-marked subset in a single collection
+    try:
+        exit_code, total_tests, smoke_tests, output = collect_tests()
+    except Exception as e:
+        print_error(f"Test discovery: ERROR ({str(e)})")
+    else:
+        if exit_code == 0:
+            print_success("Test discovery: OK")
+            print_info(f"Tests can be discovered successfully ({total_tests} tests)")
+        else:
+            print_error(f"Test discovery: FAILED (pytest exit code {exit_code})")
+            if output.strip():
+                emit(f"  Error: {output.strip()[-200:]}")
+        
+        if smoke_tests:
+            print_success("Smoke test discovery: OK")
+            print_info(f"Smoke tests are properly marked ({smoke_tests} tests)")
+        else:
+            print_error("Smoke test discovery: FAILED (no tests marked 'smoke')")
     
     # 8. Check Docker setup
     print_header("8. Docker Configuration")
@@ -231,28 +277,30 @@ def main():
     total_checks = sum(len(v) for v in checks.values())
     passed_checks = sum(sum(v) for v in checks.values())
     
-    print(f"\n{Colors.BOLD}Results:{Colors.ENDC}")
-    print(f"  Workflows:      {sum(checks['workflows'])}/{len(checks['workflows'])}")
-    print(f"  Tests:          {sum(checks['tests'])}/{len(checks['tests'])}")
-    print(f"  Configuration:  {sum(checks['config'])}/{len(checks['config'])}")
-    print(f"  Documentation:  {sum(checks['docs'])}/{len(checks['docs'])}")
-    print(f"  Python deps:    {sum(checks['python'])}/{len(checks['python'])}")
-    print(f"\n{Colors.BOLD}Total:          {passed_checks}/{total_checks}{Colors.ENDC}")
+    emit(f"\n{BOLD}Results:{ENDC}")
+    emit(f"  Workflows:      {sum(checks['workflows'])}/{len(checks['workflows'])}")
+    emit(f"  Tests:          {sum(checks['tests'])}/{len(checks['tests'])}")
+    emit(f"  Configuration:  {sum(checks['config'])}/{len(checks['config'])}")
+    emit(f"  Documentation:  {sum(checks['docs'])}/{len(checks['docs'])}")
+    emit(f"  Python deps:    {sum(checks['python'])}/{len(checks['python'])}")
+    emit(f"\n{BOLD}Total:          {passed_checks}/{total_checks}{ENDC}")
     
     if passed_checks == total_checks:
-        print(f"\n{Colors.GREEN}{Colors.BOLD}✓ All checks passed! CI/CD setup is complete.{Colors.ENDC}")
-        print(f"\n{Colors.BOLD}Next steps:{Colors.ENDC}")
-        print("  1. Run smoke tests: pytest -m smoke")
-        print("  2. Create a test PR to verify CI works")
-        print("  3. Review documentation: CI_CD_QUICK_START.md")
+        emit(f"\n{GREEN}{BOLD}✓ All checks passed! CI/CD setup is complete.{ENDC}")
+        emit(f"\n{BOLD}Next steps:{ENDC}")
+        emit("  1. Run smoke tests: pytest -m smoke")
+        emit("  2. Create a test PR to verify CI works")
+        emit("  3. Review documentation: CI_CD_QUICK_START.md")
+        flush_output()
         return 0
     else:
         failed = total_checks - passed_checks
-        print(f"\n{Colors.YELLOW}{Colors.BOLD}⚠ Setup incomplete: {failed} checks failed{Colors.ENDC}")
-        print(f"\n{Colors.BOLD}Action required:{Colors.ENDC}")
-        print("  1. Review errors above")
-        print("  2. Install missing dependencies: pip install -r requirements-test.txt")
-        print("  3. Check documentation: CI_CD_DOCUMENTATION.md")
+        emit(f"\n{YELLOW}{BOLD}⚠ Setup incomplete: {failed} checks failed{ENDC}")
+        emit(f"\n{BOLD}Action required:{ENDC}")
+        emit("  1. Review errors above")
+        emit("  2. Install missing dependencies: pip install -r requirements-test.txt")
+        emit("  3. Check documentation: CI_CD_DOCUMENTATION.md")
+        flush_output()
         return 1
 
 
@@ -260,9 +308,11 @@ if __name__ == '__main__':
     try:
         sys.exit(main())
     except KeyboardInterrupt:
-        print(f"\n\n{Colors.YELLOW}Validation interrupted by user{Colors.ENDC}")
+        flush_output()
+        print(f"\n\n{YELLOW}Validation interrupted by user{ENDC}")
         sys.exit(130)
     except Exception as e:
-        print(f"\n{Colors.RED}Validation failed with error: {e}{Colors.ENDC}")
+        flush_output()
+        print(f"\n{RED}Validation failed with error: {e}{ENDC}")
         sys.exit(1)
 
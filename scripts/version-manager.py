@@ -12,69 +12,76 @@ from datetime import datetime
 import re
 
 class VersionManager:
+    # Allowed version formats: v1.2.3 / 1.2.3, v1.2 / 1.2, v1 / 1,
+    # build-123, rc1, beta1, alpha1, dev-123
+    VERSION_PATTERN = re.compile(r'^(?:v?\d+(?:\.\d+){0,2}|build-\d+|rc\d+|beta\d+|alpha\d+|dev-\d+)$')
+
     def __init__(self):
         self.repo_path = os.getcwd()
+        # Output of read-only git queries, reused within one run
+        self._git_cache = {}
         
     def run_command(self, command, capture_output=True):
         """Run a shell command and return the result"""
         try:
-            result = subprocess.run(
-                command, 
-                shell=True, 
-                capture_output=capture_output, 
-                text=True, 
-                cwd=self.repo_path
-            )
+            if capture_output:
+                result = subprocess.run(
+                    command, 
+                    shell=True, 
+                    capture_output=True, 
+                    encoding='utf-8', 
+                    errors='replace', 
+                    cwd=self.repo_path
+                )
+            else:
+                # Output goes straight to the terminal; nothing to decode
+                result = subprocess.run(command, shell=True, cwd=self.repo_path)
             if result.returncode != 0:
                 print(f"Error running command: {command}")
-                print(f"Error: {result.stderr}")
+                if capture_output:
+                    print(f"Error: {result.stderr}")
                 return None
             return result.stdout.strip() if capture_output else result
         except Exception as e:
             print(f"Exception running command: {e}")
             return None
 
+    def run_cached_command(self, command):
+        """Run a read-only command once and reuse its output afterwards"""
+        if command not in self._git_cache:
+            self._git_cache[command] = self.run_command(command)
+        return self._git_cache[command]
+
+    def clear_cache(self):
+        """Forget cached git output (e.g. after creating a tag)"""
+        self._git_cache.clear()
+
     def get_current_branch(self):
         """Get the current git branch"""
-        return self.run_command("git branch --show-current")
+        return self.run_cached_command("git branch --show-current")
 
     def get_latest_tag(self):
         """Get the latest git tag"""
-        return self.run_command("git describe --tags --abbrev=0 2>/dev/null || echo 'none'")
+        return self.run_cached_command("git describe --tags --abbrev=0 2>/dev/null || echo 'none'")
 
     def get_commit_count(self):
         """Get the number of commits since the last tag"""
         latest_tag = self.get_latest_tag()
         if latest_tag == 'none':
-            return self.run_command("git rev-list --count HEAD")
+            return self.run_cached_command("git rev-list --count HEAD")
         else:
-            return self.run_command(f"git rev-list --count {latest_tag}..HEAD")
+            return self.run_cached_command(f"git rev-list --count {latest_tag}..HEAD")
 
     def get_commit_hash(self, short=True):
         """Get the current commit hash"""
         if short:
-            return self.run_command("git rev-parse --short HEAD")
+            return self.run_cached_command("git rev-parse --short HEAD")
         else:
-            return self.run_command("git rev-parse HEAD")
+            return self.run_cached_command("git rev-parse HEAD")
 
     def validate_version_format(self, version):
         """Validate version format"""
-        # Allow various version formats
-        patterns = [
-            r'^v?\d+\.\d+\.\d+$',  # v1.2.3 or 1.2.3
-            r'^v?\d+\.\d+$',       # v1.2 or 1.2
-            r'^v?\d+$',             # v1 or 1
-            r'^build-\d+$',         # build-123
-            r'^rc\d+$',             # rc1
-            r'^beta\d+$',           # beta1
-            r'^alpha\d+$',          # alpha1
-            r'^dev-\d+$',           # dev-123
-        ]
-        
-        for pattern in patterns:
-            if re.match(pattern, version):
-                return True
-        return False
+        return self.VERSION_PATTERN.match(version) is not None
 
     def suggest_next_version(self, current_version):
         """Suggest the next version based on current version"""
@@ -122,6 +129,7 @@ class VersionManager:
         if not self.run_command(f'git tag -a "{version}" -m "{message}"', capture_output=False):
             print("Failed to create tag")
             return False
+        self.clear_cache()
         
         print(f"✓ Tag '{version}' created successfully")
         
@@ -167,21 +175,29 @@ class VersionManager:
             print("No tags found")
             return
         
+        # Resolve commit, date and subject of the tagged commit in one git call
+        details = self.run_command(f'git log -1 --format=%H%x09%cd%x09%s {tag}')
+        commit, date, message = '', '', ''
+        if details:
+            commit, date, message = (details.split('\t', 2) + ['', ''])[:3]
+        
         print(f"Tag: {tag}")
-        print(f"Commit: {self.run_command(f'git rev-parse {tag}')}")
-        print(f"Date: {self.run_command(f'git log -1 --format=%cd {tag}')}")
-        print(f"Message: {self.run_command(f'git log -1 --format=%s {tag}')}")
+        print(f"Commit: {commit}")
+        print(f"Date: {date}")
+        print(f"Message: {message}")
         
-        # Show commits since this tag
-        commits_since = self.run_command(f'git log --oneline {tag}..HEAD')
+        # Show commits since this tag (one extra tells us whether there are more)
+        commits_since = self.run_command(f'git log --oneline --max-count=11 {tag}..HEAD')
         if commits_since:
             print(f"\nCommits since {tag}:")
-            for commit in commits_since.split('\n')[:10]:  # Show last 10 commits
+            commit_lines = commits_since.split('\n')
+            for commit in commit_lines[:10]:  # Show last 10 commits
                 if commit.strip():
                     print(f"  {commit}")
-            commit_lines = commits_since.split('\n')
             if len(commit_lines) > 10:
-                print(f"  ... and {len(commit_lines) - 10} more")
+                total = self.run_command(f'git rev-list --count {tag}..HEAD')
+                if total and total.isdigit():
+                    print(f"  ... and {int(total) - 10} more")
 
     def show_status(self):
         """Show current version status"""
@@ -46,11 +46,19 @@ def test_client_system():
             
             print("✅ Projects table has client_id column")
             
+            # Look up both test clients with a single query
+            existing_clients = {
+                client.name: client
+                for client in Client.query.filter(
+                    Client.name.in_(['Test Client Corp', 'Archive Test Client'])
+                ).all()
+            }
+            
             # Test client creation
             print("\nTesting Client Creation...")
             
             # Check if test client already exists
-            test_client = Client.query.filter_by(name='Test Client Corp').first()
+            test_client = existing_clients.get('Test Client Corp')
             if test_client:
                 print(f"✅ Test client already exists (ID: {test_client.id})")
             else:
@@ -65,7 +73,7 @@ def test_client_system():
                     default_hourly_rate=85.00
                 )
                 db.session.add(test_client)
-                db.session.commit()
+                db.session.flush()  # Assign the ID without committing yet
                 print(f"✅ Test client created (ID: {test_client.id})")
             
             # Test project creation with client
@@ -86,9 +94,16 @@ def test_client_system():
                     billing_ref='TEST-001'
                 )
                 db.session.add(test_project)
-                db.session.commit()
+                db.session.flush()
                 print(f"✅ Test project created (ID: {test_project.id})")
             
+            # Persist the created test data in one transaction
+            db.session.commit()
+            
+            # Load the client's projects once; 'projects' is a dynamic relationship,
+            # so it cannot be eager-loaded and every access would re-query
+            client_projects = test_client.projects.all()
+            
             # Test client properties
             print("\nTesting Client Properties...")
             
@@ -113,7 +128,6 @@ def test_client_system():
             # Test client relationships
             print("\nTesting Client Relationships...")
             
-            client_projects = test_client.projects.all()
             print(f"Client has {len(client_projects)} projects:")
             for project in client_projects:
                 print(f"  - {project.name} (ID: {project.id})")
@@ -130,19 +144,18 @@ def test_client_system():
             # Test client archiving (create a test client to archive)
             print("\nTesting Client Archiving...")
             
-            archive_test_client = Client.query.filter_by(name='Archive Test Client').first()
+            archive_test_client = existing_clients.get('Archive Test Client')
             if not archive_test_client:
                 archive_test_client = Client(
                     name='Archive Test Client',
                     description='Client to test archiving functionality'
                 )
                 db.session.add(archive_test_client)
-                db.session.commit()
+                db.session.flush()
                 print(f"✅ Archive test client created (ID: {archive_test_client.id})")
             
             if archive_test_client.status == 'active':
                 archive_test_client.archive()
-                db.session.commit()
                 print(f"✅ Client '{archive_test_client.name}' archived")
             else:
                 print(f"✅ Client '{archive_test_client.name}' already archived")
@@ -150,7 +163,6 @@ def test_client_system():
             # Test client activation
             if archive_test_client.status == 'inactive':
                 archive_test_client.activate()
-                db.session.commit()
                 print(f"✅ Client '{archive_test_client.name}' activated")
             
             # Clean up test data (optional)
@@ -161,7 +173,8 @@ def test_client_system():
                 db.session.delete(test_project)
                 print("✅ Test project deleted")
             
-            # Delete test clients
+            # Delete test clients (the ORM cascade removes their projects and
+            # the projects' time entries, tasks and costs)
             if test_client:
                 db.session.delete(test_client)
                 print("✅ Test client deleted")
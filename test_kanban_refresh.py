@@ -4,28 +4,42 @@ Test script to verify kanban column refresh behavior
 Run this to test if columns are being cached or loaded fresh
 """
 
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
 from app import create_app, db
 from app.models import KanbanColumn
-import time
 
-app = create_app()
+
+@contextmanager
+def count_queries(conn):
+    """Collect the SQL statements executed on ``conn`` inside the block"""
+    queries = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    event.listen(conn, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(conn, 'before_cursor_execute', before_cursor_execute)
+
+
+def _column_selects(queries):
+    """Only the SELECTs that read kanban columns"""
+    return [q for q in queries if q.lstrip().upper().startswith('SELECT') and 'kanban_columns' in q]
+
 
 def test_column_caching():
-    """Test if columns are cached or loaded fresh"""
+    """Test that active columns are always loaded fresh from the database"""
+    # Build the app here rather than at import so collecting/importing this
+    # module does not bootstrap Flask
+    app = create_app()
     with app.app_context():
-        print("=" * 60)
-        print("Testing Kanban Column Caching Behavior")
-        print("=" * 60)
-        
-        # Get initial columns
-        print("\n1. Initial column count:")
-        initial_columns = KanbanColumn.get_active_columns()
-        print(f"   Found {len(initial_columns)} active columns")
-        for col in initial_columns:
-            print(f"   - {col.key}: {col.label} (pos: {col.position})")
-        
-        # Create a test column
-        print("\n2. Creating test column...")
+        initial_count = len(KanbanColumn.get_active_columns())
+
         test_col = KanbanColumn(
             key='test_refresh',
             label='Test Refresh',
@@ -37,48 +51,27 @@ def test_column_caching():
         )
         db.session.add(test_col)
         db.session.commit()
-        print("   ✓ Test column created")
-        
-        # Check WITHOUT clearing cache
-        print("\n3. Querying columns WITHOUT cache clear:")
-        columns_no_clear = KanbanColumn.get_active_columns()
-        print(f"   Found {len(columns_no_clear)} columns")
-        test_found = any(c.key == 'test_refresh' for c in columns_no_clear)
-        print(f"   Test column found: {test_found}")
-        
-        # Clear cache and check again
-        print("\n4. Clearing cache with expire_all()...")
-        db.session.expire_all()
-        print("   Cache cleared")
-        
-        print("\n5. Querying columns AFTER cache clear:")
-        columns_after_clear = KanbanColumn.get_active_columns()
-        print(f"   Found {len(columns_after_clear)} columns")
-        test_found = any(c.key == 'test_refresh' for c in columns_after_clear)
-        print(f"   Test column found: {test_found}")
-        
-        # Clean up
-        print("\n6. Cleaning up test column...")
-        db.session.delete(test_col)
-        db.session.commit()
-        print("   ✓ Test column deleted")
-        
-        # Final count
-        print("\n7. Final column count:")
-        final_columns = KanbanColumn.get_active_columns()
-        print(f"   Found {len(final_columns)} columns")
-        
-        print("\n" + "=" * 60)
-        print("CONCLUSION:")
-        print("=" * 60)
-        if test_found:
-            print("✓ Cache clearing works correctly!")
-            print("✓ New columns appear without restart")
-        else:
-            print("✗ Cache clearing NOT working!")
-            print("✗ This explains why restart was needed")
-        print("=" * 60)
+
+        try:
+            # Without clearing the session, the lookup must still hit the database
+            with count_queries(db.session.connection()) as queries:
+                columns = KanbanColumn.get_active_columns()
+            assert len(_column_selects(queries)) == 1
+            assert any(c.key == 'test_refresh' for c in columns)
+
+            # ...and exactly once after expire_all() as well
+            db.session.expire_all()
+            with count_queries(db.session.connection()) as queries:
+                columns = KanbanColumn.get_active_columns()
+            assert len(_column_selects(queries)) == 1
+            assert any(c.key == 'test_refresh' for c in columns)
+        finally:
+            db.session.delete(test_col)
+            db.session.commit()
+
+        assert len(KanbanColumn.get_active_columns()) == initial_count
+
 
 if __name__ == '__main__':
     test_column_caching()
-
+    print("✓ Kanban columns are loaded fresh; new columns appear without restart")
@@ -13,10 +13,70 @@ Usage:
     python test_migration_018.py
 """
 
+import heapq
 import os
+import re
 import sys
 from pathlib import Path
 
+# Everything below is built once at import; tuples keep the report order
+# Required snippets of the migration file and what they stand for
+CHECKS = {
+    "revision = '018'": "Revision ID",
+    "down_revision = '017'": "Down revision",
+    "def upgrade()": "Upgrade function",
+    "def downgrade()": "Downgrade function",
+    "create_table": "Create table statement",
+    "project_costs": "Table name",
+    "create_index": "Index creation",
+    "create_foreign_key": "Foreign key creation",
+}
+
+COLUMNS = (
+    'id',
+    'project_id',
+    'user_id',
+    'description',
+    'category',
+    'amount',
+    'currency_code',
+    'billable',
+    'invoiced',
+    'cost_date'
+)
+
+INDEXES = (
+    ('ix_project_costs_project_id', 'project_id'),
+    ('ix_project_costs_user_id', 'user_id'),
+    ('ix_project_costs_cost_date', 'cost_date'),
+    ('ix_project_costs_invoice_id', 'invoice_id')
+)
+
+FOREIGN_KEYS = (
+    'fk_project_costs_project_id',
+    'fk_project_costs_user_id',
+    'fk_project_costs_invoice_id'
+)
+
+REQUIRED = frozenset(
+    set(CHECKS)
+    | {f"'{col}'" for col in COLUMNS}
+    | {f'"{col}"' for col in COLUMNS}
+    | {idx_name for idx_name, _ in INDEXES}
+    | set(FOREIGN_KEYS)
+)
+
+# One pass over the file finds every required snippet. The lookahead lets
+# matches overlap (e.g. "project_costs" inside an index name), and longer
+# snippets come first so none hides behind a shorter one at the same spot.
+REQUIRED_RE = re.compile(
+    '(?=(' + '|'.join(map(re.escape, sorted(REQUIRED, key=len, reverse=True))) + '))'
+)
+
+# op.create_index('<name>', '<table>', [<columns>]) -> (name, columns)
+CREATE_INDEX_RE = re.compile(r"create_index\(\s*['\"](\w+)['\"][^\[\n]*\[([^\]]*)\]")
+
+
 def test_migration_file():
     """Test that the migration file exists and is valid"""
     print("Testing migration 018...")
@@ -31,91 +91,54 @@ def test_migration_file():
     
     # Read and parse the file
     try:
-        with open(migration_file, 'r') as f:
-            content = f.read()
+        content = migration_file.read_text()
+        found = set(REQUIRED_RE.findall(content))
+        index_columns = dict(CREATE_INDEX_RE.findall(content))
+        missing = []
         
         # Check required components
-        checks = {
-            "revision = '018'": "Revision ID",
-            "down_revision = '017'": "Down revision",
-            "def upgrade()": "Upgrade function",
-            "def downgrade()": "Downgrade function",
-            "create_table": "Create table statement",
-            "project_costs": "Table name",
-            "create_index": "Index creation",
-            "create_foreign_key": "Foreign key creation",
-        }
-        
-        for check, description in checks.items():
-            if check in content:
+        for check, description in CHECKS.items():
+            if check in found:
                 print(f"✓ {description} found")
             else:
                 print(f"✗ {description} not found!")
-                return False
+                missing.append(check)
         
         # Check for key columns
-        columns = [
-            'id',
-            'project_id',
-            'user_id',
-            'description',
-            'category',
-            'amount',
-            'currency_code',
-            'billable',
-            'invoiced',
-            'cost_date'
-        ]
-        
         print("\nChecking columns...")
-        for col in columns:
-            if f"'{col}'" in content or f'"{col}"' in content:
+        for col in COLUMNS:
+            if f"'{col}'" in found or f'"{col}"' in found:
                 print(f"  ✓ Column '{col}' defined")
             else:
                 print(f"  ✗ Column '{col}' not found!")
-                return False
+                missing.append(f"'{col}'")
         
-        # Check indexes
+        # Check indexes (and that each is on the right column)
         print("\nChecking indexes...")
-        indexes = [
-            ('ix_project_costs_project_id', 'project_id'),
-            ('ix_project_costs_user_id', 'user_id'),
-            ('ix_project_costs_cost_date', 'cost_date'),
-            ('ix_project_costs_invoice_id', 'invoice_id')
-        ]
-        
-        for idx_name, column_name in indexes:
-            if idx_name in content:
-                # Verify the index is on the correct column
-                # Find the line with the index definition
-                for line in content.split('\n'):
-                    if idx_name in line and 'create_index' in line:
-                        if f"['{column_name}']" in line:
-                            print(f"  ✓ Index '{idx_name}' defined on column '{column_name}'")
-                            break
-                        else:
-                            print(f"  ✗ Index '{idx_name}' defined but on wrong column!")
-                            return False
-                else:
-                    print(f"  ✓ Index '{idx_name}' defined")
-            else:
+        for idx_name, column_name in INDEXES:
+            if idx_name not in found:
                 print(f"  ✗ Index '{idx_name}' not found!")
-                return False
+                missing.append(idx_name)
+            elif idx_name not in index_columns:
+                print(f"  ✓ Index '{idx_name}' defined")
+            elif f"'{column_name}'" in index_columns[idx_name]:
+                print(f"  ✓ Index '{idx_name}' defined on column '{column_name}'")
+            else:
+                print(f"  ✗ Index '{idx_name}' defined but on wrong column!")
+                missing.append(f"{idx_name} on '{column_name}'")
         
         # Check foreign keys
         print("\nChecking foreign keys...")
-        fks = [
-            'fk_project_costs_project_id',
-            'fk_project_costs_user_id',
-            'fk_project_costs_invoice_id'
-        ]
-        
-        for fk in fks:
-            if fk in content:
+        for fk in FOREIGN_KEYS:
+            if fk in found:
                 print(f"  ✓ Foreign key '{fk}' defined")
             else:
                 print(f"  ✗ Foreign key '{fk}' not found!")
-                return False
+                missing.append(fk)
+        
+        if missing:
+            print(f"\n✗ Missing from migration file: {', '.join(missing)}")
+            return False
         
         print("\n✓ All checks passed!")
         return True
@@ -135,15 +158,19 @@ def test_migration_chain():
         print("✗ Migrations directory not found!")
         return False
     
-    # Get all migration files
-    migrations = sorted([f for f in versions_dir.glob("*.py") if not f.name.startswith('__')])
+    # Get all migration file names (no full sort: only the last few are shown)
+    with os.scandir(versions_dir) as entries:
+        migrations = [
+            entry.name for entry in entries
+            if entry.is_file() and entry.name.endswith('.py') and not entry.name.startswith('__')
+        ]
     
     print(f"\nFound {len(migrations)} migration files:")
-    for mig in migrations[-5:]:  # Show last 5
-        print(f"  - {mig.name}")
+    for name in reversed(heapq.nlargest(5, migrations)):  # Show last 5
+        print(f"  - {name}")
     
     # Check that 018 is the latest
-    latest = migrations[-1].name
+    latest = max(migrations)
     if latest == "018_add_project_costs_table.py":
         print("\n✓ Migration 018 is the latest migration")
         return True
@@ -6,16 +6,35 @@ This file contains common fixtures and test configuration used across all test m
 import pytest
 import os
 import tempfile
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from decimal import Decimal
 
-from app import create_app, db
+from flask_login import FlaskLoginClient
+from flask_login.config import COOKIE_NAME as REMEMBER_COOKIE_NAME
+from flask_sqlalchemy.session import Session as FlaskSQLAlchemySession
+from sqlalchemy import event, insert, select
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy.pool import StaticPool
+from werkzeug.exceptions import MethodNotAllowed, NotFound
+
+from app import cache, create_app, db, limiter
 from app.models import (
     User, Project, TimeEntry, Client, Settings, 
     Invoice, InvoiceItem, Task
 )
 
 
+# Work-day slots for ``multiple_time_entries``, computed once per session.
+# The base is a UTC midnight a week back: fixed times of day, still recent
+# enough for "last N days" reports.
+_BASE_TIME = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=7)
+_TIME_SLOTS = [
+    (_BASE_TIME + timedelta(days=i, hours=9), _BASE_TIME + timedelta(days=i, hours=17))
+    for i in range(5)
+]
+
+
 # ============================================================================
 # Application Fixtures
 # ============================================================================
@@ -25,8 +44,21 @@ def app_config():
     """Base test configuration."""
     return {
         'TESTING': True,
+        # Every pytest-xdist worker is its own process and so gets its own
+        # in-memory database; no per-worker naming is needed for -n auto
         'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        # One in-memory database shared by every connection and thread; this
+        # also replaces the production pool_pre_ping/pool_recycle options
+        'SQLALCHEMY_ENGINE_OPTIONS': {
+            'poolclass': StaticPool,
+            'connect_args': {'check_same_thread': False},
+            # The ORM issues the same few statements over and over; keep all
+            # of their compiled forms cached for the whole session
+            'query_cache_size': 1200,
+        },
         'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        # Never log SQL in tests, whatever the environment sets
+        'SQLALCHEMY_ECHO': False,
         'WTF_CSRF_ENABLED': False,
         'SECRET_KEY': 'test-secret-key-do-not-use-in-production',
         'SERVER_NAME': 'localhost:5000',
@@ -35,12 +67,93 @@ def app_config():
     }
 
 
-@pytest.fixture(scope='function')
-def app(app_config):
-    """Create application for testing with function scope."""
+class TransactionalSession(FlaskSQLAlchemySession):
+    """Session that always runs on the connection it is bound to.
+
+    Flask-SQLAlchemy's session ignores ``bind`` and picks the app engine, which
+    would bypass the per-test transaction the ``app`` fixture opens.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.bind is not None:
+            return self.bind
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _configure_sqlite_engine(engine):
+    """Tune the throwaway SQLite test database.
+
+    SQLAlchemy, not pysqlite, issues BEGIN so SAVEPOINTs nest correctly, and
+    durability work (syncs, on-disk journal/temp files) is switched off.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _configure_connection(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA synchronous=OFF')
+        cursor.execute('PRAGMA journal_mode=MEMORY')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.close()
+
+    @event.listens_for(engine, 'begin')
+    def _emit_begin(conn):
+        conn.exec_driver_sql('BEGIN')
+
+
+def _eager_reload(request, obj, *options):
+    """Re-select a fixture object with its relationships eagerly loaded.
+
+    Tests that also request ``strict_loading`` get ``raiseload('*')`` on top, so
+    touching any relationship that was not eager-loaded raises.
+    """
+    model = type(obj)
+    if 'strict_loading' in request.fixturenames:
+        options += (raiseload('*'),)
+    stmt = (
+        select(model)
+        .options(*options)
+        .where(model.id == obj.id)
+        .execution_options(populate_existing=True)
+    )
+    return db.session.execute(stmt).scalar_one()
+
+
+@contextmanager
+def _session_bound_to(connection):
+    """Point ``db.session`` at ``connection``, joining its transaction via SAVEPOINTs."""
+    app_session = db.session
+    db.session = db._make_scoped_session({
+        'bind': connection,
+        'class_': TransactionalSession,
+        'join_transaction_mode': 'create_savepoint',
+        # Tests only: everything runs in one transaction that is rolled back,
+        # so reloading every attribute after each commit buys nothing
+        'expire_on_commit': False,
+    })
+    try:
+        yield db.session
+    finally:
+        db.session.remove()
+        db.session = app_session
+
+
+# Connection holding a module-level transaction while ``module_transaction``
+# is active; per-test transactions nest inside it as SAVEPOINTs.
+_module_connection = None
+
+
+@pytest.fixture(scope='session')
+def session_app(app_config):
+    """Create the application and database schema once per test session."""
     app = create_app(app_config)
+    # ``app.test_client(user=...)`` starts out logged in as that user
+    app.test_client_class = FlaskLoginClient
     
     with app.app_context():
+        _configure_sqlite_engine(db.engine)
         db.create_all()
         
         # Create default settings
@@ -55,9 +168,110 @@ def app(app_config):
 
 
 @pytest.fixture(scope='function')
-def client(app):
-    """Create test client."""
-    return app.test_client()
+def app(session_app):
+    """Application for a single test; its database changes are rolled back.
+
+    Each test runs inside an outer transaction on a dedicated connection, or
+    in a SAVEPOINT of the module transaction when one is open. ``db.session``
+    joins it through SAVEPOINTs, so commits made by fixtures, routes and tests
+    stay visible to the test and are discarded afterwards.
+    """
+    config = dict(session_app.config)
+    
+    with session_app.app_context():
+        if _module_connection is not None:
+            connection, owns_connection = _module_connection, False
+            transaction = connection.begin_nested()
+        else:
+            connection, owns_connection = db.engine.connect(), True
+            transaction = connection.begin()
+        
+        try:
+            with _session_bound_to(connection):
+                yield session_app
+        finally:
+            transaction.rollback()
+            if owns_connection:
+                connection.close()
+            
+            # Undo per-test configuration changes, rate-limit counters and
+            # cached responses (their data was just rolled back)
+            session_app.config.clear()
+            session_app.config.update(config)
+            limiter.reset()
+            cache.clear()
+
+
+@pytest.fixture(scope='module')
+def module_transaction(session_app):
+    """Outer transaction shared by every test of a module.
+
+    Rows created in it (see ``readonly_*`` fixtures) are inserted once per
+    module and rolled back after the module's last test.
+    """
+    global _module_connection
+    
+    with session_app.app_context():
+        connection = db.engine.connect()
+    transaction = connection.begin()
+    _module_connection = connection
+    
+    try:
+        yield connection
+    finally:
+        _module_connection = None
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope='module')
+def module_seed(session_app, module_transaction):
+    """Run a seeding function once in the module transaction.
+
+    ``module_seed(create)`` calls ``create()`` with ``db.session`` bound to the
+    module transaction, commits, and returns its result (typically row ids;
+    tests re-read the rows in their own session).
+    """
+    def seed(create):
+        # Seeds build many related rows before flushing them explicitly; skip
+        # the autoflush their intermediate lookups would trigger
+        with session_app.app_context(), _session_bound_to(module_transaction) as session, \
+                session.no_autoflush:
+            result = create()
+            session.commit()
+            return result
+    return seed
+
+
+# Cookies that carry a login or a CSRF token between requests: config keys
+# for the name (with its default), domain and path
+_CLIENT_COOKIES = (
+    ('SESSION_COOKIE_NAME', 'session', 'SESSION_COOKIE_DOMAIN', 'SESSION_COOKIE_PATH'),
+    ('REMEMBER_COOKIE_NAME', REMEMBER_COOKIE_NAME, 'REMEMBER_COOKIE_DOMAIN', 'REMEMBER_COOKIE_PATH'),
+    ('CSRF_COOKIE_NAME', 'XSRF-TOKEN', 'CSRF_COOKIE_DOMAIN', 'CSRF_COOKIE_PATH'),
+)
+
+
+@pytest.fixture(scope='module')
+def _module_client(session_app):
+    """Test client shared by the tests of a module (see ``client``)."""
+    return session_app.test_client()
+
+
+@pytest.fixture(scope='function')
+def client(app, _module_client):
+    """Create test client.
+
+    The module's client is reused; its session, remember-me and CSRF cookies
+    are deleted first so every test starts logged out.
+    """
+    for name_key, default_name, domain_key, path_key in _CLIENT_COOKIES:
+        _module_client.delete_cookie(
+            app.config.get(name_key, default_name),
+            domain=app.config.get(domain_key) or 'localhost',
+            path=app.config.get(path_key) or '/',
+        )
+    return _module_client
 
 
 @pytest.fixture(scope='function')
@@ -72,9 +286,29 @@ def runner(app):
 
 @pytest.fixture(scope='function')
 def db_session(app):
-    """Create a database session for tests."""
-    with app.app_context():
-        yield db.session
+    """Database session for tests (rolled back when the test ends)."""
+    yield db.session
+
+
+@pytest.fixture
+def factory(app):
+    """Bulk-create rows with one multi-row INSERT ... RETURNING.
+
+    ``factory(Model, count, per_row, **common)`` inserts ``count`` rows built
+    from ``common`` plus ``per_row(i)`` and returns the ORM objects in order.
+    Rows go straight to the table, so model ``__init__`` logic does not run.
+    """
+    def make(model_cls, count, per_row=None, **common):
+        rows = [{**common, **(per_row(i) if per_row else {})} for i in range(count)]
+        stmt = insert(model_cls).returning(model_cls, sort_by_parameter_order=True)
+        return db.session.scalars(stmt, rows).all()
+    return make
+
+
+@pytest.fixture
+def strict_loading():
+    """Opt-in: make lazy loads on project/time_entry/invoice fixtures raise."""
+    return True
 
 
 # ============================================================================
@@ -91,10 +325,8 @@ def user(app):
     )
     user.is_active = True  # Set after creation
     db.session.add(user)
-    db.session.commit()
+    db.session.flush()
     
-    # Refresh to ensure all relationships are loaded
-    db.session.refresh(user)
     return user
 
 
@@ -108,27 +340,19 @@ def admin_user(app):
     )
     admin.is_active = True  # Set after creation
     db.session.add(admin)
-    db.session.commit()
+    db.session.flush()
     
-    db.session.refresh(admin)
     return admin
 
 
 @pytest.fixture
-def multiple_users(app):
+def multiple_users(factory):
     """Create multiple test users."""
-    users = []
-    for i in range(1, 4):
-        user = User(username=f'user{i}', role='user', email=f'user{i}@example.com')
-        user.is_active = True  # Set after creation
-        users.append(user)
-    db.session.add_all(users)
-    db.session.commit()
-    
-    for user in users:
-        db.session.refresh(user)
-    
-    return users
+    return factory(
+        User, 3,
+        lambda i: {'username': f'user{i+1}', 'email': f'user{i+1}@example.com'},
+        role='user', is_active=True
+    )
 
 
 # ============================================================================
@@ -149,31 +373,23 @@ def test_client(app, user):
     )
     client.status = 'active'  # Set after creation
     db.session.add(client)
-    db.session.commit()
+    db.session.flush()
     
-    db.session.refresh(client)
     return client
 
 
 @pytest.fixture
-def multiple_clients(app, user):
+def multiple_clients(factory, user):
     """Create multiple test clients."""
-    clients = []
-    for i in range(1, 4):
-        client = Client(
-            name=f'Client {i}',
-            email=f'client{i}@example.com',
-            default_hourly_rate=Decimal('75.00') + Decimal(i * 10)
-        )
-        client.status = 'active'  # Set after creation
-        clients.append(client)
-    db.session.add_all(clients)
-    db.session.commit()
-    
-    for client in clients:
-        db.session.refresh(client)
-    
-    return clients
+    return factory(
+        Client, 3,
+        lambda i: {
+            'name': f'Client {i+1}',
+            'email': f'client{i+1}@example.com',
+            'default_hourly_rate': Decimal('75.00') + Decimal((i + 1) * 10),
+        },
+        status='active'
+    )
 
 
 # ============================================================================
@@ -181,7 +397,7 @@ def multiple_clients(app, user):
 # ============================================================================
 
 @pytest.fixture
-def project(app, test_client):
+def project(app, request, test_client):
     """Create a test project."""
     project = Project(
         name='Test Project',
@@ -192,33 +408,68 @@ def project(app, test_client):
     )
     project.status = 'active'  # Set after creation
     db.session.add(project)
-    db.session.commit()
+    db.session.flush()
     
-    db.session.refresh(project)
-    return project
+    return _eager_reload(request, project, selectinload(Project.client_obj))
 
 
 @pytest.fixture
-def multiple_projects(app, test_client):
+def multiple_projects(factory, test_client):
     """Create multiple test projects."""
-    projects = []
-    for i in range(1, 4):
+    return factory(
+        Project, 3,
+        lambda i: {'name': f'Project {i+1}', 'description': f'Test project {i+1}'},
+        client_id=test_client.id, billable=True, hourly_rate=Decimal('75.00'), status='active'
+    )
+
+
+# ============================================================================
+# Read-only Fixtures (created once per module)
+# ============================================================================
+
+@pytest.fixture(scope='module')
+def readonly_rows(module_seed):
+    """Insert a client, project and task once per module; return their ids."""
+    def create():
+        owner = User(username='readonly_owner', role='user', email='readonly_owner@example.com')
+        client = Client(name='Read-only Client Corp', default_hourly_rate=Decimal('85.00'))
+        db.session.add_all([owner, client])
+        db.session.flush()
+        
         project = Project(
-            name=f'Project {i}',
-            client_id=test_client.id,
-            description=f'Test project {i}',
+            name='Read-only Project',
+            client_id=client.id,
+            description='Shared read-only project',
             billable=True,
             hourly_rate=Decimal('75.00')
         )
-        project.status = 'active'  # Set after creation
-        projects.append(project)
-    db.session.add_all(projects)
-    db.session.commit()
-    
-    for proj in projects:
-        db.session.refresh(proj)
+        db.session.add(project)
+        db.session.flush()
+        
+        task = Task(name='Read-only Task', project_id=project.id, created_by=owner.id)
+        db.session.add(task)
+        db.session.flush()
+        return {'client': client.id, 'project': project.id, 'task': task.id}
     
-    return projects
+    return module_seed(create)
+
+
+@pytest.fixture
+def readonly_client(app, readonly_rows):
+    """Module-scoped client row; tests must not modify it."""
+    return db.session.get(Client, readonly_rows['client'])
+
+
+@pytest.fixture
+def readonly_project(app, readonly_rows):
+    """Module-scoped project row; tests must not modify it."""
+    return db.session.get(Project, readonly_rows['project'])
+
+
+@pytest.fixture
+def readonly_task(app, readonly_rows):
+    """Module-scoped task row; tests must not modify it."""
+    return db.session.get(Task, readonly_rows['task'])
 
 
 # ============================================================================
@@ -226,7 +477,7 @@ def multiple_projects(app, test_client):
 # ============================================================================
 
 @pytest.fixture
-def time_entry(app, user, project):
+def time_entry(app, request, user, project):
     """Create a single time entry."""
     start_time = datetime.utcnow() - timedelta(hours=2)
     end_time = datetime.utcnow()
@@ -242,41 +493,31 @@ def time_entry(app, user, project):
         billable=True
     )
     db.session.add(entry)
-    db.session.commit()
+    db.session.flush()
     
-    db.session.refresh(entry)
-    return entry
+    return _eager_reload(
+        request, entry, selectinload(TimeEntry.user), selectinload(TimeEntry.project)
+    )
 
 
 @pytest.fixture
-def multiple_time_entries(app, user, project):
+def multiple_time_entries(factory, user, project):
     """Create multiple time entries."""
-    base_time = datetime.utcnow() - timedelta(days=7)
-    entries = []
+    def slot(i):
+        start, end = _TIME_SLOTS[i]
+        return {
+            'start_time': start,
+            'end_time': end,
+            # Whole hours, so identical to calculate_duration() at any rounding
+            'duration_seconds': int((end - start).total_seconds()),
+            'notes': f'Work day {i+1}',
+        }
     
-    for i in range(5):
-        start = base_time + timedelta(days=i, hours=9)
-        end = base_time + timedelta(days=i, hours=17)
-        
-        entry = TimeEntry(
-            user_id=user.id,
-            project_id=project.id,
-            start_time=start,
-            end_time=end,
-            notes=f'Work day {i+1}',
-            tags='development,testing',
-            source='manual',
-            billable=True
-        )
-        entries.append(entry)
-    
-    db.session.add_all(entries)
-    db.session.commit()
-    
-    for entry in entries:
-        db.session.refresh(entry)
-    
-    return entries
+    return factory(
+        TimeEntry, len(_TIME_SLOTS), slot,
+        user_id=user.id, project_id=project.id,
+        tags='development,testing', source='manual', billable=True
+    )
 
 
 @pytest.fixture
@@ -291,9 +532,8 @@ def active_timer(app, user, project):
         billable=True
     )
     db.session.add(timer)
-    db.session.commit()
+    db.session.flush()
     
-    db.session.refresh(timer)
     return timer
 
 
@@ -313,9 +553,8 @@ def task(app, project, user):
     )
     task.status = 'todo'  # Set after creation
     db.session.add(task)
-    db.session.commit()
+    db.session.flush()
     
-    db.session.refresh(task)
     return task
 
 
@@ -324,7 +563,7 @@ def task(app, project, user):
 # ============================================================================
 
 @pytest.fixture
-def invoice(app, user, project, test_client):
+def invoice(app, request, user, project, test_client):
     """Create a test invoice."""
     from datetime import date
     
@@ -339,10 +578,12 @@ def invoice(app, user, project, test_client):
     )
     invoice.status = 'draft'  # Set after creation
     db.session.add(invoice)
-    db.session.commit()
+    db.session.flush()
     
-    db.session.refresh(invoice)
-    return invoice
+    return _eager_reload(
+        request, invoice,
+        selectinload(Invoice.project), selectinload(Invoice.client), selectinload(Invoice.creator)
+    )
 
 
 @pytest.fixture
@@ -364,14 +605,10 @@ def invoice_with_items(app, invoice):
     ]
     
     db.session.add_all(items)
-    db.session.commit()
+    db.session.flush()
     
     invoice.calculate_totals()
-    db.session.commit()
-    
-    db.session.refresh(invoice)
-    for item in items:
-        db.session.refresh(item)
+    db.session.flush()
     
     return invoice, items
 
@@ -381,21 +618,15 @@ def invoice_with_items(app, invoice):
 # ============================================================================
 
 @pytest.fixture
-def authenticated_client(client, user):
+def authenticated_client(app, user):
     """Create an authenticated test client."""
-    with client.session_transaction() as sess:
-        sess['_user_id'] = str(user.id)
-        sess['_fresh'] = True
-    return client
+    return app.test_client(user=user)
 
 
 @pytest.fixture
-def admin_authenticated_client(client, admin_user):
+def admin_authenticated_client(app, admin_user):
     """Create an authenticated admin test client."""
-    with client.session_transaction() as sess:
-        sess['_user_id'] = str(admin_user.id)
-        sess['_fresh'] = True
-    return client
+    return app.test_client(user=admin_user)
 
 
 # ============================================================================
@@ -420,6 +651,34 @@ def temp_dir():
     shutil.rmtree(dirpath)
 
 
+# ============================================================================
+# Route Availability
+# ============================================================================
+
+@pytest.fixture(scope='session')
+def url_adapter(session_app):
+    """URL map adapter of the shared app, built once per session."""
+    return session_app.url_map.bind(session_app.config['SERVER_NAME'])
+
+
+@pytest.fixture(autouse=True)
+def _skip_unregistered_routes(request):
+    """Skip tests marked ``route(path, method='GET')`` whose route is missing.
+
+    Tests for endpoints that are not implemented would otherwise only check
+    for a 404 while still paying for a full request.
+    """
+    marker = request.node.get_closest_marker('route')
+    if marker is None:
+        return
+    path = marker.args[0]
+    method = marker.kwargs.get('method', 'GET')
+    try:
+        request.getfixturevalue('url_adapter').match(path, method=method)
+    except (NotFound, MethodNotAllowed):
+        pytest.skip(f'{method} {path} is not registered')
+
+
 # ============================================================================
 # Pytest Markers
 # ============================================================================
@@ -436,4 +695,5 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "security: Security tests")
     config.addinivalue_line("markers", "performance: Performance tests")
     config.addinivalue_line("markers", "slow: Slow running tests")
+    config.addinivalue_line("markers", "route(path, method): Skip unless the route is registered")
 
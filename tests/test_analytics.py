@@ -1,54 +1,90 @@
 import pytest
+from freezegun import freeze_time
 from app import db
 from app.models import User, Project, TimeEntry
 from datetime import datetime, timedelta
 from app.models import Task
 
+# Fixed reference point for the sample data (a Monday); the clock is frozen
+# shortly after it, so "last N days" windows and weekly buckets never move
+BASE_TIME = datetime(2024, 1, 1)
+
+def _create_sample_data():
+    # Create test user
+    user = User(username='testuser', role='user')
+    user.is_active = True
+    db.session.add(user)
+    
+    # Create test project
+    project = Project(name='Test Project', client='Test Client')
+    db.session.add(project)
+    
+    db.session.flush()
+    
+    # Store IDs before session ends
+    user_id = user.id
+    project_id = project.id
+    
+    # Create test time entries (8 hours each)
+    base_time = BASE_TIME
+    db.session.bulk_insert_mappings(TimeEntry, [
+        {
+            'user_id': user_id,
+            'project_id': project_id,
+            'start_time': base_time + timedelta(days=i),
+            'end_time': base_time + timedelta(days=i, hours=8),
+            'duration_seconds': 8 * 3600,
+            'billable': True,
+        }
+        for i in range(5)
+    ])
+    
+    # Create some tasks for task-completion endpoint
+    task_rows = [
+        {'name': 'T1', 'status': 'done', 'completed_at': BASE_TIME + timedelta(days=5)},
+        {'name': 'T2', 'status': 'in_progress'},
+        {'name': 'T3', 'status': 'todo'},
+    ]
+    for row in task_rows:
+        row.update(project_id=project_id, created_by=user_id, assigned_to=user_id)
+    db.session.bulk_insert_mappings(Task, task_rows)
+    
+    db.session.flush()
+    
+    return {'user_id': user_id, 'project_id': project_id}
+
+@pytest.fixture(scope='module', autouse=True)
+def frozen_clock():
+    """Freeze "now" at the Sunday after the sample week for the whole module"""
+    # pytest's own timing (--durations) keeps the real clock
+    with freeze_time(BASE_TIME + timedelta(days=6, hours=12), ignore=['_pytest']):
+        yield
+
+@pytest.fixture(scope='module')
+def sample_data(module_seed):
+    """Seed analytics data once for the module.
+
+    Each test runs in a SAVEPOINT of the module transaction, so changes a test
+    makes (e.g. promoting the user to admin) are rolled back after it.
+    """
+    return module_seed(_create_sample_data)
+
+@pytest.fixture(scope='module')
+def logged_in_client(session_app, sample_data):
+    """Test client logged in as the sample user, shared by the module"""
+    client = session_app.test_client()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(sample_data['user_id'])
+        sess['_fresh'] = True
+    return client
+
 @pytest.fixture
-def sample_data(app):
-    with app.app_context():
-        # Create test user
-        user = User(username='testuser', role='user')
-        user.is_active = True
-        db.session.add(user)
-        
-        # Create test project
-        project = Project(name='Test Project', client='Test Client')
-        db.session.add(project)
-        
-        db.session.commit()
-        
-        # Store IDs before session ends
-        user_id = user.id
-        project_id = project.id
-        
-        # Create test time entries
-        base_time = datetime.now() - timedelta(days=5)
-        for i in range(5):
-            entry = TimeEntry(
-                user_id=user_id,
-                project_id=project_id,
-                start_time=base_time + timedelta(days=i),
-                end_time=base_time + timedelta(days=i, hours=8),
-                billable=True
-            )
-            db.session.add(entry)
-        
-        # Create some tasks for task-completion endpoint
-        t1 = Task(project_id=project_id, name='T1', created_by=user_id, assigned_to=user_id)
-        t1.status = 'done'
-        t1.completed_at = datetime.now() - timedelta(days=1)
-        db.session.add(t1)
-        t2 = Task(project_id=project_id, name='T2', created_by=user_id, assigned_to=user_id)
-        t2.status = 'in_progress'
-        db.session.add(t2)
-        t3 = Task(project_id=project_id, name='T3', created_by=user_id, assigned_to=user_id)
-        t3.status = 'todo'
-        db.session.add(t3)
-
-        db.session.commit()
-        
-        return {'user_id': user_id, 'project_id': project_id}
+def admin_client(app, logged_in_client, sample_data):
+    """The logged in client with the sample user promoted to admin for one test"""
+    user = db.session.get(User, sample_data['user_id'])
+    user.role = 'admin'
+    db.session.flush()
+    return logged_in_client
 
 @pytest.mark.integration
 @pytest.mark.routes
@@ -59,185 +95,313 @@ def test_analytics_dashboard_requires_login(client):
 
 @pytest.mark.integration
 @pytest.mark.routes
-def test_analytics_dashboard_accessible_when_logged_in(client, app, sample_data):
+def test_analytics_dashboard_accessible_when_logged_in(logged_in_client, app):
     """Test that analytics dashboard is accessible when logged in"""
-    with app.app_context():
-        with client.session_transaction() as sess:
-            # Simulate login
-            sess['_user_id'] = str(sample_data['user_id'])
-            sess['_fresh'] = True
-        
-        response = client.get('/analytics')
-        assert response.status_code == 200
-        assert b'Analytics Dashboard' in response.data
+    response = logged_in_client.get('/analytics')
+    assert response.status_code == 200
+    assert b'Analytics Dashboard' in response.data
+
+# Chart endpoints returning {'labels': [...], 'datasets': [...]}, with an extra
+# check on the payload for each
+CHART_ENDPOINTS = [
+    pytest.param('/api/analytics/hours-by-day?days=7',
+                 lambda data: len(data['datasets']) > 0, id='hours-by-day'),
+    pytest.param('/api/analytics/hours-by-project?days=7',
+                 lambda data: len(data['labels']) > 0, id='hours-by-project'),
+    pytest.param('/api/analytics/billable-vs-nonbillable?days=7',
+                 lambda data: len(data['labels']) == 2, id='billable-vs-nonbillable'),  # Billable and Non-Billable
+    pytest.param('/api/analytics/hours-by-hour?days=7',
+                 lambda data: len(data['labels']) == 24, id='hours-by-hour'),  # 24 hours
+    pytest.param('/api/analytics/weekly-trends?weeks=4',
+                 lambda data: True, id='weekly-trends'),
+    pytest.param('/api/analytics/project-efficiency?days=7',
+                 lambda data: True, id='project-efficiency'),
+]
 
 @pytest.mark.integration
 @pytest.mark.api
-def test_hours_by_day_api(client, app, sample_data):
-    """Test hours by day API endpoint"""
-    with app.app_context():
-        with client.session_transaction() as sess:
-            sess['_user_id'] = str(sample_data['user_id'])
-            sess['_fresh'] = True
-        
-        response = client.get('/api/analytics/hours-by-day?days=7')
-        assert response.status_code == 200
-        
-        data = response.get_json()
-        assert 'labels' in data
-        assert 'datasets' in data
-        assert len(data['datasets']) > 0
+@pytest.mark.parametrize('url, check', CHART_ENDPOINTS)
+def test_chart_api(logged_in_client, app, url, check):
+    """Test the chart API endpoints return labels and datasets"""
+    response = logged_in_client.get(url)
+    assert response.status_code == 200
+    
+    data = response.get_json()
+    assert 'labels' in data
+    assert 'datasets' in data
+    assert check(data)
 
 @pytest.mark.integration
 @pytest.mark.api
-def test_hours_by_project_api(client, app, sample_data):
-    """Test hours by project API endpoint"""
-    with app.app_context():
-        with client.session_transaction() as sess:
-            sess['_user_id'] = str(sample_data['user_id'])
-            sess['_fresh'] = True
-        
-        response = client.get('/api/analytics/hours-by-project?days=7')
-        assert response.status_code == 200
-        
-        data = response.get_json()
-        assert 'labels' in data
-        assert 'datasets' in data
-        assert len(data['labels']) > 0
+def test_task_completion_api(logged_in_client, app):
+    """Test task completion analytics API endpoint structure"""
+    response = logged_in_client.get('/api/analytics/task-completion?days=7')
+    assert response.status_code == 200
+
+    data = response.get_json()
+    assert 'status_breakdown' in data
+    sb = data['status_breakdown'] or {}
+    # Ensure essential keys exist
+    for key in ['done', 'in_progress', 'todo', 'review', 'cancelled']:
+        assert key in sb
 
 @pytest.mark.integration
 @pytest.mark.api
-def test_billable_vs_nonbillable_api(client, app, sample_data):
-    """Test billable vs non-billable API endpoint"""
-    with app.app_context():
-        with client.session_transaction() as sess:
-            sess['_user_id'] = str(sample_data['user_id'])
-            sess['_fresh'] = True
-        
-        response = client.get('/api/analytics/billable-vs-nonbillable?days=7')
-        assert response.status_code == 200
-        
-        data = response.get_json()
-        assert 'labels' in data
-        assert 'datasets' in data
-        assert len(data['labels']) == 2  # Billable and Non-Billable
+@pytest.mark.security
+def test_user_performance_api_requires_admin(logged_in_client, app):
+    """Test that user performance API requires admin access"""
+    response = logged_in_client.get('/api/analytics/hours-by-user?days=7')
+    assert response.status_code == 403  # Forbidden for non-admin users
 
 @pytest.mark.integration
 @pytest.mark.api
-def test_hours_by_hour_api(client, app, sample_data):
-    """Test hours by hour API endpoint"""
-    with app.app_context():
-        with client.session_transaction() as sess:
-            sess['_user_id'] = str(sample_data['user_id'])
-            sess['_fresh'] = True
-        
-        response = client.get('/api/analytics/hours-by-hour?days=7')
-        assert response.status_code == 200
-        
-        data = response.get_json()
-        assert 'labels' in data
-        assert 'datasets' in data
-        assert len(data['labels']) == 24  # 24 hours
+def test_user_performance_api_accessible_by_admin(admin_client, app):
+    """Test that user performance API is accessible by admin users"""
+    response = admin_client.get('/api/analytics/hours-by-user?days=7')
+    assert response.status_code == 200
+    
+    data = response.get_json()
+    assert 'labels' in data
+    assert 'datasets' in data
 
 @pytest.mark.integration
 @pytest.mark.api
-def test_weekly_trends_api(client, app, sample_data):
-    """Test weekly trends API endpoint"""
-    with app.app_context():
-        with client.session_transaction() as sess:
-            sess['_user_id'] = str(sample_data['user_id'])
-            sess['_fresh'] = True
-        
-        response = client.get('/api/analytics/weekly-trends?weeks=4')
-        assert response.status_code == 200
-        
-        data = response.get_json()
-        assert 'labels' in data
-        assert 'datasets' in data
+def test_api_endpoints_with_invalid_parameters(logged_in_client, app):
+    """Test API endpoints with invalid parameters"""
+    # Test with invalid days parameter
+    response = logged_in_client.get('/api/analytics/hours-by-day?days=invalid')
+    assert response.status_code == 400  # Should return 400 for invalid parameter
+    
+    # Out-of-range values are rejected the same way, on every endpoint
+    for url in ('/api/analytics/hours-by-project?days=0', '/api/analytics/insights?days=-5',
+                '/api/analytics/revenue-metrics?days=3651', '/api/analytics/weekly-trends?weeks=x'):
+        response = logged_in_client.get(url)
+        assert response.status_code == 400
+        assert 'Invalid' in response.get_json()['error']
+    
+    # Test with missing parameter (should use default)
+    response = logged_in_client.get('/api/analytics/hours-by-day')
+    assert response.status_code == 200
 
 @pytest.mark.integration
 @pytest.mark.api
-def test_task_completion_api(client, app, sample_data):
-    """Test task completion analytics API endpoint structure"""
-    with app.app_context():
-        with client.session_transaction() as sess:
-            sess['_user_id'] = str(sample_data['user_id'])
-            sess['_fresh'] = True
+def test_weekly_trends_sums_per_monday(logged_in_client, app, sample_data):
+    """Test weekly trends group entries by the Monday of their week"""
+    expected = {}
+    for entry in TimeEntry.query.filter_by(user_id=sample_data['user_id']):
+        monday = entry.start_time.date() - timedelta(days=entry.start_time.weekday())
+        expected[monday] = expected.get(monday, 0) + entry.duration_seconds
+    
+    response = logged_in_client.get('/api/analytics/weekly-trends?weeks=4')
+    assert response.status_code == 200
+    
+    data = response.get_json()
+    assert data['labels'] == [monday.strftime('%b %d') for monday in sorted(expected)]
+    assert data['datasets'][0]['data'] == [round(expected[m] / 3600, 2) for m in sorted(expected)]
+
+@pytest.mark.integration
+@pytest.mark.api
+def test_billable_vs_nonbillable_totals(logged_in_client, app, sample_data):
+    """Test billable and non-billable hours are summed separately"""
+    response = logged_in_client.get('/api/analytics/billable-vs-nonbillable?days=7')
+    assert response.status_code == 200
+    
+    # Five billable 8 hour entries
+    assert response.get_json()['datasets'][0]['data'] == [40.0, 0]
 
-        response = client.get('/api/analytics/task-completion?days=7')
-        assert response.status_code == 200
+@pytest.mark.integration
+@pytest.mark.api
+@pytest.mark.parametrize('url', [
+    '/api/analytics/hours-by-day?days=7',
+    '/api/analytics/hours-by-project?days=7',
+    '/api/analytics/billable-vs-nonbillable?days=7',
+    '/api/analytics/weekly-trends?weeks=4',
+])
+def test_chart_api_without_rollup_matches_rollup(logged_in_client, app, sample_data, monkeypatch, url):
+    """Test the time_entries fallback returns the same payload as the rollup"""
+    from app import cache
+    from app.routes import analytics
+    
+    from_rollup = logged_in_client.get(url)
+    assert from_rollup.status_code == 200
+    
+    cache.clear()
+    monkeypatch.setattr(analytics, 'daily_hours_available', lambda: False)
+    from_entries = logged_in_client.get(url)
+    assert from_entries.status_code == 200
+    assert from_entries.get_json() == from_rollup.get_json()
 
-        data = response.get_json()
-        assert 'status_breakdown' in data
-        sb = data['status_breakdown'] or {}
-        # Ensure essential keys exist
-        for key in ['done', 'in_progress', 'todo', 'review', 'cancelled']:
-            assert key in sb
+@pytest.mark.models
+@pytest.mark.database
+def test_daily_hours_rollup_follows_time_entries(app, sample_data):
+    """Test the rollup triggers track inserts, updates and deletes of entries"""
+    from app.models import DailyHoursRollup
+    user_id, project_id = sample_data['user_id'], sample_data['project_id']
+    
+    def bucket():
+        row = db.session.get(DailyHoursRollup, (start.date(), user_id, project_id))
+        return (row.billable_seconds, row.nonbillable_seconds) if row else None
+    
+    start = datetime(2024, 1, 8, 9, 0)
+    entry = TimeEntry(user_id=user_id, project_id=project_id, start_time=start,
+                      end_time=start + timedelta(hours=2), billable=True)
+    db.session.add(entry)
+    db.session.commit()
+    assert bucket() == (7200, 0)
+    
+    entry.billable = False
+    db.session.commit()
+    db.session.expire_all()
+    assert bucket() == (0, 7200)
+    
+    db.session.delete(entry)
+    db.session.commit()
+    db.session.expire_all()
+    assert bucket() is None
 
 @pytest.mark.integration
 @pytest.mark.api
-def test_project_efficiency_api(client, app, sample_data):
-    """Test project efficiency API endpoint"""
-    with app.app_context():
-        with client.session_transaction() as sess:
-            sess['_user_id'] = str(sample_data['user_id'])
-            sess['_fresh'] = True
-        
-        response = client.get('/api/analytics/project-efficiency?days=7')
-        assert response.status_code == 200
-        
-        data = response.get_json()
-        assert 'labels' in data
-        assert 'datasets' in data
+def test_hours_by_project_drops_project_without_hours(logged_in_client, app, sample_data):
+    """Test a project whose only entry was deleted is no longer listed"""
+    url = '/api/analytics/hours-by-project?days=7'
+    project = Project(name='Short Project', client='Test Client')
+    db.session.add(project)
+    db.session.flush()
+    start = BASE_TIME + timedelta(days=2, hours=9)
+    entry = TimeEntry(user_id=sample_data['user_id'], project_id=project.id, start_time=start,
+                      end_time=start + timedelta(hours=1), billable=True)
+    db.session.add(entry)
+    db.session.commit()
+    assert 'Short Project' in logged_in_client.get(url).get_json()['labels']
+    
+    db.session.delete(entry)
+    db.session.commit()
+    assert logged_in_client.get(url).get_json()['labels'] == ['Test Project']
+
+@pytest.mark.models
+@pytest.mark.database
+def test_rebuild_daily_hours(app, sample_data):
+    """Test the rollup can be recomputed from time entries"""
+    from app.models import DailyHoursRollup
+    from app.utils.daily_hours import daily_hours_available, rebuild_daily_hours
+    
+    assert daily_hours_available() is True
+    before = {(r.day, r.user_id, r.project_id, r.billable_seconds) for r in DailyHoursRollup.query}
+    
+    assert rebuild_daily_hours() is True
+    after = {(r.day, r.user_id, r.project_id, r.billable_seconds) for r in DailyHoursRollup.query}
+    assert after == before
+    assert sum(seconds for *_, seconds in after) == 5 * 8 * 3600
+
+@pytest.mark.unit
+@pytest.mark.database
+def test_daily_hours_available_only_caches_success(app, monkeypatch):
+    """Test a failed or negative rollup probe is retried instead of sticking"""
+    from sqlalchemy.exc import OperationalError
+    from app.utils import daily_hours
+    
+    monkeypatch.setattr(daily_hours, '_rollup_available', {})
+    key = str(db.engine.url)
+    
+    # A transient error falls back without remembering the result
+    def fail(connection):
+        raise OperationalError('probe', {}, Exception('connection reset'))
+    with monkeypatch.context() as m:
+        m.setattr(daily_hours, 'inspect', fail)
+        assert daily_hours.daily_hours_available() is False
+    assert key not in daily_hours._rollup_available
+    
+    # A missing table is re-checked once its recheck time has passed
+    daily_hours._rollup_available[key] = 0
+    assert daily_hours.daily_hours_available() is True
+    assert daily_hours._rollup_available[key] is True
 
 @pytest.mark.integration
 @pytest.mark.api
-@pytest.mark.security
-def test_user_performance_api_requires_admin(client, app, sample_data):
-    """Test that user performance API requires admin access"""
-    with app.app_context():
-        with client.session_transaction() as sess:
-            sess['_user_id'] = str(sample_data['user_id'])
-            sess['_fresh'] = True
-        
-        response = client.get('/api/analytics/hours-by-user?days=7')
-        assert response.status_code == 403  # Forbidden for non-admin users
+def test_analytics_api_cached_until_data_changes(logged_in_client, app, sample_data, monkeypatch):
+    """Test responses are served from cache until an analytics model is committed"""
+    from flask import Response
+    from sqlalchemy import text
+    from app import cache
+    from app.utils.analytics_cache import _user_version_key
+    # pytest-flask's test response class cannot be pickled into the cache
+    monkeypatch.setattr(app, 'response_class', Response)
+    url = '/api/analytics/billable-vs-nonbillable?days=7'
+    start = BASE_TIME + timedelta(days=4, hours=9)
+    
+    assert logged_in_client.get(url).get_json()['datasets'][0]['data'] == [40.0, 0]
+    
+    # Raw SQL is invisible to the ORM, so the cached response is still served
+    db.session.execute(text(
+        'INSERT INTO time_entries (user_id, project_id, start_time, end_time, duration_seconds, '
+        'source, billable, created_at, updated_at) '
+        "VALUES (:u, :p, :s, :e, 3600, 'manual', 0, :s, :s)"
+    ), {'u': sample_data['user_id'], 'p': sample_data['project_id'], 's': start, 'e': start + timedelta(hours=1)})
+    db.session.commit()
+    assert logged_in_client.get(url).get_json()['datasets'][0]['data'] == [40.0, 0]
+    
+    # Committing through the ORM invalidates it
+    db.session.add(TimeEntry(user_id=sample_data['user_id'], project_id=sample_data['project_id'],
+                             start_time=start, end_time=start + timedelta(hours=1), billable=False))
+    db.session.commit()
+    assert logged_in_client.get(url).get_json()['datasets'][0]['data'] == [40.0, 2.0]
+    
+    # A lost version (eviction, restart) must not bring back older responses
+    db.session.execute(text(
+        'INSERT INTO time_entries (user_id, project_id, start_time, end_time, duration_seconds, '
+        'source, billable, created_at, updated_at) '
+        "VALUES (:u, :p, :s, :e, 3600, 'manual', 0, :s, :s)"
+    ), {'u': sample_data['user_id'], 'p': sample_data['project_id'], 's': start, 'e': start + timedelta(hours=1)})
+    db.session.commit()
+    cache.delete(_user_version_key(sample_data['user_id']))
+    assert logged_in_client.get(url).get_json()['datasets'][0]['data'] == [40.0, 3.0]
 
 @pytest.mark.integration
 @pytest.mark.api
-def test_user_performance_api_accessible_by_admin(client, app, sample_data):
-    """Test that user performance API is accessible by admin users"""
-    with app.app_context():
-        # Make user admin
-        user_id = sample_data['user_id']
-        user = db.session.get(User, user_id)
-        user.role = 'admin'
-        db.session.commit()
-        
-        with client.session_transaction() as sess:
-            sess['_user_id'] = str(user_id)
-            sess['_fresh'] = True
-        
-        response = client.get('/api/analytics/hours-by-user?days=7')
-        assert response.status_code == 200
-        
-        data = response.get_json()
-        assert 'labels' in data
-        assert 'datasets' in data
+def test_analytics_api_cache_invalidation_is_per_user(logged_in_client, app, sample_data, monkeypatch):
+    """Test other users' entries and logins leave a user's cached analytics alone"""
+    from flask import Response
+    from sqlalchemy import text
+    # pytest-flask's test response class cannot be pickled into the cache
+    monkeypatch.setattr(app, 'response_class', Response)
+    url = '/api/analytics/billable-vs-nonbillable?days=7'
+    start = BASE_TIME + timedelta(days=4, hours=9)
+    
+    def insert_raw_entry():
+        # Invisible to the ORM: only shows up once the response is recomputed
+        db.session.execute(text(
+            'INSERT INTO time_entries (user_id, project_id, start_time, end_time, duration_seconds, '
+            'source, billable, created_at, updated_at) '
+            "VALUES (:u, :p, :s, :e, 3600, 'manual', 0, :s, :s)"
+        ), {'u': sample_data['user_id'], 'p': sample_data['project_id'], 's': start, 'e': start + timedelta(hours=1)})
+    
+    assert logged_in_client.get(url).get_json()['datasets'][0]['data'] == [40.0, 0]
+    insert_raw_entry()
+    
+    # Another user's time entry and this user's login keep the cached response
+    other = User(username='otheruser', role='user')
+    db.session.add(other)
+    db.session.flush()
+    db.session.add(TimeEntry(user_id=other.id, project_id=sample_data['project_id'],
+                             start_time=start, end_time=start + timedelta(hours=1), billable=False))
+    db.session.get(User, sample_data['user_id']).update_last_login()
+    db.session.commit()
+    assert logged_in_client.get(url).get_json()['datasets'][0]['data'] == [40.0, 0]
+    
+    # A change to this user's own entries invalidates it
+    entry = TimeEntry.query.filter_by(user_id=sample_data['user_id']).first()
+    entry.notes = 'edited'
+    db.session.commit()
+    assert logged_in_client.get(url).get_json()['datasets'][0]['data'] == [40.0, 1.0]
 
 @pytest.mark.integration
 @pytest.mark.api
-def test_api_endpoints_with_invalid_parameters(client, app, sample_data):
-    """Test API endpoints with invalid parameters"""
-    with app.app_context():
-        with client.session_transaction() as sess:
-            sess['_user_id'] = str(sample_data['user_id'])
-            sess['_fresh'] = True
-        
-        # Test with invalid days parameter
-        response = client.get('/api/analytics/hours-by-day?days=invalid')
-        assert response.status_code == 400  # Should return 400 for invalid parameter
-        
-        # Test with missing parameter (should use default)
-        response = client.get('/api/analytics/hours-by-day')
-        assert response.status_code == 200
+def test_analytics_api_revalidates_with_etag(logged_in_client, app, sample_data):
+    """Test analytics responses carry an ETag and answer 304 when unchanged"""
+    url = '/api/analytics/hours-by-day?days=7'
+    response = logged_in_client.get(url)
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+    etag = response.headers['ETag']
+    
+    response = logged_in_client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 304
@@ -15,6 +15,7 @@ import json
 
 @pytest.mark.api
 @pytest.mark.integration
+@pytest.mark.route('/api/timer/start', method='POST')
 def test_start_timer_api(authenticated_client, project):
     """Test starting a timer via API."""
     response = authenticated_client.post('/api/timer/start', json={
@@ -22,18 +23,21 @@ def test_start_timer_api(authenticated_client, project):
         'notes': 'Working on feature'
     })
     
-    # Should succeed or return appropriate status
-    assert response.status_code in [200, 201, 404, 405]
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['success'] is True
+    assert data['timer_id']
 
 
 @pytest.mark.api
 @pytest.mark.integration
+@pytest.mark.route('/api/timer/status')
 def test_get_timer_status(authenticated_client):
     """Test getting timer status."""
     response = authenticated_client.get('/api/timer/status')
     
-    # Should return status or appropriate error
-    assert response.status_code in [200, 404]
+    assert response.status_code == 200
+    assert response.get_json()['active'] is False
 
 
 # ============================================================================
@@ -42,22 +46,24 @@ def test_get_timer_status(authenticated_client):
 
 @pytest.mark.api
 @pytest.mark.integration
-def test_get_projects_list(authenticated_client):
+@pytest.mark.route('/api/projects')
+def test_get_projects_list(authenticated_client, project):
     """Test getting list of projects."""
     response = authenticated_client.get('/api/projects')
     
-    # Should return projects list or appropriate error
-    assert response.status_code in [200, 404]
+    assert response.status_code == 200
+    assert [p['id'] for p in response.get_json()['projects']] == [project.id]
 
 
 @pytest.mark.api
 @pytest.mark.integration
+@pytest.mark.route('/api/projects/1')
 def test_get_project_details(authenticated_client, project):
     """Test getting project details."""
     response = authenticated_client.get(f'/api/projects/{project.id}')
     
-    # Should return project details or appropriate error
-    assert response.status_code in [200, 404]
+    assert response.status_code == 200
+    assert response.get_json()['id'] == project.id
 
 
 # ============================================================================
@@ -66,22 +72,13 @@ def test_get_project_details(authenticated_client, project):
 
 @pytest.mark.api
 @pytest.mark.integration
-def test_get_time_entries(authenticated_client):
-    """Test getting time entries list."""
-    response = authenticated_client.get('/api/time-entries')
-    
-    # Should return time entries or appropriate error
-    assert response.status_code in [200, 404]
-
-
-@pytest.mark.api
-@pytest.mark.integration
+@pytest.mark.route('/api/time-entries/1')
 def test_get_time_entry_details(authenticated_client, time_entry):
     """Test getting time entry details."""
     response = authenticated_client.get(f'/api/time-entries/{time_entry.id}')
     
-    # Should return time entry details or appropriate error
-    assert response.status_code in [200, 404]
+    assert response.status_code == 200
+    assert response.get_json()['id'] == time_entry.id
 
 
 # ============================================================================
@@ -90,22 +87,24 @@ def test_get_time_entry_details(authenticated_client, time_entry):
 
 @pytest.mark.api
 @pytest.mark.integration
-def test_get_clients_list(authenticated_client):
+@pytest.mark.route('/api/clients')
+def test_get_clients_list(authenticated_client, test_client):
     """Test getting list of clients."""
     response = authenticated_client.get('/api/clients')
     
-    # Should return clients list or appropriate error
-    assert response.status_code in [200, 404]
+    assert response.status_code == 200
+    assert [c['id'] for c in response.get_json()['clients']] == [test_client.id]
 
 
 @pytest.mark.api
 @pytest.mark.integration
+@pytest.mark.route('/api/clients/1')
 def test_get_client_details(authenticated_client, test_client):
     """Test getting client details."""
     response = authenticated_client.get(f'/api/clients/{test_client.id}')
     
-    # Should return client details or appropriate error
-    assert response.status_code in [200, 404]
+    assert response.status_code == 200
+    assert response.get_json()['id'] == test_client.id
 
 
 # ============================================================================
@@ -114,22 +113,13 @@ def test_get_client_details(authenticated_client, test_client):
 
 @pytest.mark.api
 @pytest.mark.integration
-def test_get_invoices_list(authenticated_client):
-    """Test getting list of invoices."""
-    response = authenticated_client.get('/api/invoices')
-    
-    # Should return invoices list or appropriate error
-    assert response.status_code in [200, 404]
-
-
-@pytest.mark.api
-@pytest.mark.integration
+@pytest.mark.route('/api/invoices/1')
 def test_get_invoice_details(authenticated_client, invoice):
     """Test getting invoice details."""
     response = authenticated_client.get(f'/api/invoices/{invoice.id}')
     
-    # Should return invoice details or appropriate error
-    assert response.status_code in [200, 404]
+    assert response.status_code == 200
+    assert response.get_json()['id'] == invoice.id
 
 
 # ============================================================================
@@ -138,25 +128,12 @@ def test_get_invoice_details(authenticated_client, invoice):
 
 @pytest.mark.api
 @pytest.mark.integration
-def test_get_time_report(authenticated_client):
-    """Test getting time report."""
-    response = authenticated_client.get('/api/reports/time', query_string={
-        'start_date': (datetime.utcnow() - timedelta(days=7)).strftime('%Y-%m-%d'),
-        'end_date': datetime.utcnow().strftime('%Y-%m-%d')
-    })
-    
-    # Should return report or appropriate error
-    assert response.status_code in [200, 404, 500]
-
-
-@pytest.mark.api
-@pytest.mark.integration
+@pytest.mark.route('/api/reports/projects/1')
 def test_get_project_report(authenticated_client, project):
     """Test getting project report."""
     response = authenticated_client.get(f'/api/reports/projects/{project.id}')
     
-    # Should return report or appropriate error
-    assert response.status_code in [200, 404]
+    assert response.status_code == 200
 
 
 # ============================================================================
@@ -165,50 +142,29 @@ def test_get_project_report(authenticated_client, project):
 
 @pytest.mark.api
 @pytest.mark.integration
-def test_get_tasks_list(authenticated_client):
+@pytest.mark.route('/api/tasks')
+def test_get_tasks_list(authenticated_client, task):
     """Test getting list of tasks."""
+    # The project is a required parameter
     response = authenticated_client.get('/api/tasks')
+    assert response.status_code == 400
     
-    # Should return tasks list or appropriate error (400 is also valid if params are required)
-    assert response.status_code in [200, 400, 404]
+    response = authenticated_client.get('/api/tasks', query_string={'project_id': task.project_id})
+    assert response.status_code == 200
+    assert [t['id'] for t in response.get_json()['tasks']] == [task.id]
 
 
 @pytest.mark.api
 @pytest.mark.integration
+@pytest.mark.route('/api/tasks/1')
 def test_get_task_details(authenticated_client, task):
     """Test getting task details."""
     response = authenticated_client.get(f'/api/tasks/{task.id}')
     
-    # Should return task details or appropriate error
-    assert response.status_code in [200, 404]
-
-
-# ============================================================================
-# Settings API Tests
-# ============================================================================
-
-@pytest.mark.api
-@pytest.mark.integration
-def test_get_settings(authenticated_client):
-    """Test getting application settings."""
-    response = authenticated_client.get('/api/settings')
-    
-    # Should return settings or appropriate error
-    assert response.status_code in [200, 404]
-
-
-# ============================================================================
-# Analytics API Tests
-# ============================================================================
-
-@pytest.mark.api
-@pytest.mark.integration
-def test_get_dashboard_stats(authenticated_client):
-    """Test getting dashboard statistics."""
-    response = authenticated_client.get('/api/analytics/dashboard')
-    
-    # Should return stats or appropriate error
-    assert response.status_code in [200, 404, 500]
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['id'] == task.id
+    assert data['name'] == task.name
 
 
 # ============================================================================
@@ -217,30 +173,51 @@ def test_get_dashboard_stats(authenticated_client):
 
 @pytest.mark.api
 @pytest.mark.integration
-def test_search_api(authenticated_client):
+@pytest.mark.route('/api/search')
+def test_search_api(authenticated_client, project):
     """Test search API endpoint."""
     response = authenticated_client.get('/api/search', query_string={
         'q': 'test'
     })
     
-    # Should return search results or appropriate error
-    assert response.status_code in [200, 400, 404]
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert {'type': 'project', 'id': project.id} in [
+        {'type': r['type'], 'id': r['id']} for r in results
+    ]
 
 
 # ============================================================================
-# Export API Tests
+# Status-only API Tests
 # ============================================================================
 
+# Last week's date range, read from one clock sample so both ends agree
+# even when collection straddles midnight UTC
+_NOW = datetime.utcnow()
+_LAST_WEEK = {
+    'start_date': (_NOW - timedelta(days=7)).strftime('%Y-%m-%d'),
+    'end_date': _NOW.strftime('%Y-%m-%d'),
+}
+
+
 @pytest.mark.api
 @pytest.mark.integration
-def test_export_time_entries(authenticated_client):
-    """Test exporting time entries."""
-    response = authenticated_client.get('/api/export/time-entries', query_string={
-        'format': 'csv',
-        'start_date': (datetime.utcnow() - timedelta(days=7)).strftime('%Y-%m-%d'),
-        'end_date': datetime.utcnow().strftime('%Y-%m-%d')
-    })
+@pytest.mark.parametrize('url,params', [
+    pytest.param('/api/time-entries', None,
+                 marks=pytest.mark.route('/api/time-entries'), id='time-entries'),
+    pytest.param('/api/invoices', None,
+                 marks=pytest.mark.route('/api/invoices'), id='invoices'),
+    pytest.param('/api/reports/time', _LAST_WEEK,
+                 marks=pytest.mark.route('/api/reports/time'), id='time-report'),
+    pytest.param('/api/settings', None,
+                 marks=pytest.mark.route('/api/settings'), id='settings'),
+    pytest.param('/api/analytics/dashboard', None,
+                 marks=pytest.mark.route('/api/analytics/dashboard'), id='dashboard-stats'),
+    pytest.param('/api/export/time-entries', {'format': 'csv', **_LAST_WEEK},
+                 marks=pytest.mark.route('/api/export/time-entries'), id='export-time-entries'),
+])
+def test_api_get_ok(authenticated_client, url, params):
+    """Test GET endpoints that only need to answer 200 for a plain user."""
+    response = authenticated_client.get(url, query_string=params)
     
-    # Should return export or appropriate error
-    assert response.status_code in [200, 404, 500]
-
+    assert response.status_code == 200
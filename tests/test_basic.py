@@ -1,4 +1,5 @@
 import pytest
+from freezegun import freeze_time
 from app import db
 from app.models import User, Project, TimeEntry, Settings, Client
 from datetime import datetime, timedelta
@@ -7,6 +8,18 @@ from decimal import Decimal
 # Note: All fixtures are now imported from conftest.py
 # No duplicate fixtures needed here
 
+# The clock is frozen here for the whole module (UTC)
+NOW = datetime(2024, 6, 15, 12, 0, 0)
+
+
+@pytest.fixture(scope='module', autouse=True)
+def frozen_clock():
+    """Freeze "now" at NOW for every test in the module"""
+    # pytest's own timing (--durations) keeps the real clock
+    with freeze_time(NOW, ignore=['_pytest']):
+        yield
+
+
 @pytest.mark.smoke
 @pytest.mark.unit
 def test_app_creation(app):
@@ -18,15 +31,18 @@ def test_app_creation(app):
 @pytest.mark.database
 def test_database_creation(app):
     """Test that database tables can be created"""
-    with app.app_context():
-        # Check that tables exist using inspect
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        tables = inspector.get_table_names()
-        assert 'users' in tables
-        assert 'projects' in tables
-        assert 'time_entries' in tables
-        assert 'settings' in tables
+    from sqlalchemy import inspect
+    # One catalog query, on the test transaction's own connection
+    tables = set(inspect(db.session.connection()).get_table_names())
+    assert {'users', 'projects', 'time_entries', 'settings'} <= tables
+
+@pytest.mark.smoke
+@pytest.mark.database
+def test_database_uses_shared_static_pool(app):
+    """Test that the test database is one shared in-memory SQLite database"""
+    from sqlalchemy.pool import StaticPool
+    assert isinstance(db.engine.pool, StaticPool)
+    assert db.engine.url.database == ':memory:'
 
 @pytest.mark.unit
 @pytest.mark.models
@@ -83,7 +99,7 @@ def test_project_creation(app):
 @pytest.mark.models
 def test_time_entry_creation(app, user, project):
     """Test time entry creation"""
-    start_time = datetime.utcnow()
+    start_time = NOW
     end_time = start_time + timedelta(hours=2)
     
     entry = TimeEntry(
@@ -111,7 +127,7 @@ def test_active_timer(app, user, project):
     timer = TimeEntry(
         user_id=user.id,
         project_id=project.id,
-        start_time=datetime.utcnow(),
+        start_time=NOW,
         source='auto'
     )
     db.session.add(timer)
@@ -131,24 +147,17 @@ def test_active_timer(app, user, project):
 @pytest.mark.models
 def test_user_active_timer_property(app, user, project):
     """Test user active timer property"""
-    # Refresh user to check initial state
-    db.session.refresh(user)
-    
     # Create active timer
     timer = TimeEntry(
         user_id=user.id,
         project_id=project.id,
-        start_time=datetime.utcnow(),
+        start_time=NOW,
         source='auto'
     )
     db.session.add(timer)
     db.session.commit()
     
-    # Refresh user to load relationships
-    db.session.expire(user)
-    db.session.refresh(user)
-    
-    # Check active timer
+    # active_timer queries time_entries on every access, so no reload is needed
     assert user.active_timer is not None
     assert user.active_timer.id == timer.id
 
@@ -156,32 +165,23 @@ def test_user_active_timer_property(app, user, project):
 @pytest.mark.models
 def test_project_totals(app, user, project):
     """Test project total calculations"""
-    # Create time entries
-    start_time = datetime.utcnow()
-    entry1 = TimeEntry(
-        user_id=user.id,
-        project_id=project.id,
-        start_time=start_time,
-        end_time=start_time + timedelta(hours=2),
-        source='manual',
-        billable=True
-    )
-    entry2 = TimeEntry(
-        user_id=user.id,
-        project_id=project.id,
-        start_time=start_time + timedelta(hours=3),
-        end_time=start_time + timedelta(hours=5),
-        source='manual',
-        billable=True
-    )
-    db.session.add_all([entry1, entry2])
+    # Create time entries (bulk insert: no per-object unit-of-work bookkeeping)
+    start_time = NOW
+    db.session.bulk_insert_mappings(TimeEntry, [
+        {
+            'user_id': user.id,
+            'project_id': project.id,
+            'start_time': start_time + timedelta(hours=offset),
+            'end_time': start_time + timedelta(hours=offset + 2),
+            'duration_seconds': 2 * 3600,
+            'source': 'manual',
+            'billable': True,
+        }
+        for offset in (0, 3)
+    ])
     db.session.commit()
     
-    # Refresh project to load relationships
-    db.session.expire(project)
-    db.session.refresh(project)
-    
-    # Check totals
+    # Totals are SUM queries over time_entries, so no reload is needed
     assert project.total_hours == 4.0
     assert project.total_billable_hours == 4.0
     expected_cost = 4.0 * float(project.hourly_rate)
@@ -1,4 +1,5 @@
 import pytest
+from freezegun import freeze_time
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 from app import db
@@ -9,7 +10,7 @@ def sample_user(app):
     """Create a sample user for testing."""
     user = User(username='testuser', role='user')
     db.session.add(user)
-    db.session.commit()
+    db.session.flush()
     return user
 
 @pytest.fixture
@@ -23,7 +24,7 @@ def sample_project(app):
         hourly_rate=Decimal('75.00')
     )
     db.session.add(project)
-    db.session.commit()
+    db.session.flush()
     return project
 
 @pytest.fixture
@@ -36,7 +37,7 @@ def sample_invoice(app, sample_user, sample_project):
         email='sample@test.com'
     )
     db.session.add(client)
-    db.session.commit()
+    db.session.flush()
     
     invoice = Invoice(
         invoice_number='INV-20241201-001',
@@ -47,7 +48,7 @@ def sample_invoice(app, sample_user, sample_project):
         client_id=client.id
     )
     db.session.add(invoice)
-    db.session.commit()
+    db.session.flush()
     return invoice
 
 @pytest.mark.smoke
@@ -104,22 +105,13 @@ def test_invoice_item_creation(app, sample_invoice):
 @pytest.mark.invoices
 def test_invoice_totals_calculation(app, sample_invoice):
     """Test that invoice totals are calculated correctly."""
-    # Add multiple items
-    item1 = InvoiceItem(
-        invoice_id=sample_invoice.id,
-        description='Development work',
-        quantity=Decimal('10.00'),
-        unit_price=Decimal('75.00')
-    )
-    
-    item2 = InvoiceItem(
-        invoice_id=sample_invoice.id,
-        description='Design work',
-        quantity=Decimal('5.00'),
-        unit_price=Decimal('100.00')
-    )
-    
-    db.session.add_all([item1, item2])
+    # Add multiple items (bulk insert bypasses __init__, so totals are given)
+    db.session.bulk_insert_mappings(InvoiceItem, [
+        {'invoice_id': sample_invoice.id, 'description': 'Development work',
+         'quantity': Decimal('10.00'), 'unit_price': Decimal('75.00'), 'total_amount': Decimal('750.00')},
+        {'invoice_id': sample_invoice.id, 'description': 'Design work',
+         'quantity': Decimal('5.00'), 'unit_price': Decimal('100.00'), 'total_amount': Decimal('500.00')},
+    ])
     db.session.commit()
     
     # Calculate totals
@@ -173,16 +165,10 @@ def test_invoice_with_tax(app, sample_user, sample_project):
 
 def test_invoice_number_generation(app):
     """Test that invoice numbers are generated correctly."""
-    # This test would need to be run in isolation or with a clean database
-    # as it depends on the current date and existing invoice numbers
-    
-    # First invoice
-    invoice_number = Invoice.generate_invoice_number()
-    # Just check the format, not the exact date
-    assert invoice_number is not None
-    assert 'INV-' in invoice_number
-    assert len(invoice_number.split('-')) == 3
-        
+    with freeze_time('2024-12-01 12:00:00'):
+        # First invoice of the day
+        assert Invoice.generate_invoice_number() == 'INV-20241201-001'
+
 
 def test_invoice_overdue_status(app, sample_user, sample_project):
     """Test that invoices are marked as overdue correctly."""
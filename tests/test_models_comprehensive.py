@@ -40,8 +40,6 @@ def test_user_is_admin_property(app, admin_user):
 @pytest.mark.models
 def test_user_active_timer(app, user, active_timer):
     """Test user active_timer property."""
-    # Refresh user to load relationships
-    db.session.refresh(user)
     assert user.active_timer is not None
     assert user.active_timer.id == active_timer.id
 
@@ -50,7 +48,6 @@ def test_user_active_timer(app, user, active_timer):
 @pytest.mark.models
 def test_user_time_entries_relationship(app, user, multiple_time_entries):
     """Test user time entries relationship."""
-    db.session.refresh(user)
     assert len(user.time_entries.all()) == 5
 
 
@@ -85,7 +82,6 @@ def test_client_creation(app, test_client):
 @pytest.mark.models
 def test_client_projects_relationship(app, test_client, multiple_projects):
     """Test client projects relationship."""
-    db.session.refresh(test_client)
     assert len(test_client.projects.all()) == 3
 
 
@@ -93,7 +89,6 @@ def test_client_projects_relationship(app, test_client, multiple_projects):
 @pytest.mark.models
 def test_client_total_projects_property(app, test_client, multiple_projects):
     """Test client total_projects property."""
-    db.session.refresh(test_client)
     assert test_client.total_projects == 3
 
 
@@ -101,8 +96,6 @@ def test_client_total_projects_property(app, test_client, multiple_projects):
 @pytest.mark.models
 def test_client_archive_activate(app, test_client):
     """Test client archive and activate methods."""
-    db.session.refresh(test_client)
-    
     # Archive client
     test_client.archive()
     db.session.commit()
@@ -151,19 +144,27 @@ def test_project_creation(app, project):
 @pytest.mark.models
 def test_project_client_relationship(app, project, test_client):
     """Test project client relationship."""
-    db.session.refresh(project)
-    db.session.refresh(test_client)
     assert project.client_id == test_client.id
     # Check backward compatibility
     if hasattr(project, 'client'):
         assert project.client == test_client.name
 
 
+@pytest.mark.unit
+@pytest.mark.models
+def test_fixture_relationships_eager_loaded(app, strict_loading, test_client, time_entry):
+    """Test fixture relationships are eager-loaded and other lazy loads raise."""
+    from sqlalchemy.exc import InvalidRequestError
+    assert time_entry.project.client == test_client.name
+    assert time_entry.user.username == 'testuser'
+    with pytest.raises(InvalidRequestError):
+        time_entry.task
+
+
 @pytest.mark.unit
 @pytest.mark.models
 def test_project_time_entries_relationship(app, project, multiple_time_entries):
     """Test project time entries relationship."""
-    db.session.refresh(project)
     assert len(project.time_entries.all()) == 5
 
 
@@ -171,7 +172,6 @@ def test_project_time_entries_relationship(app, project, multiple_time_entries):
 @pytest.mark.models
 def test_project_total_hours(app, project, multiple_time_entries):
     """Test project total_hours property."""
-    db.session.refresh(project)
     # Each entry is 8 hours (9am to 5pm), 5 entries = 40 hours
     assert project.total_hours > 0
 
@@ -180,7 +180,6 @@ def test_project_total_hours(app, project, multiple_time_entries):
 @pytest.mark.models
 def test_project_estimated_cost(app, project, multiple_time_entries):
     """Test project estimated_cost property."""
-    db.session.refresh(project)
     estimated_cost = project.estimated_cost
     assert estimated_cost > 0
     # Cost should be hours * hourly_rate
@@ -192,7 +191,6 @@ def test_project_estimated_cost(app, project, multiple_time_entries):
 @pytest.mark.models
 def test_project_archive(app, project):
     """Test project archiving."""
-    db.session.refresh(project)
     project.status = 'archived'
     db.session.commit()
     assert project.status == 'archived'
@@ -216,7 +214,6 @@ def test_time_entry_creation(app, time_entry):
 @pytest.mark.models
 def test_time_entry_duration(app, time_entry):
     """Test time entry duration calculations."""
-    db.session.refresh(time_entry)
     assert time_entry.duration_seconds > 0
     assert time_entry.duration_hours > 0
     assert time_entry.duration_formatted is not None
@@ -226,7 +223,6 @@ def test_time_entry_duration(app, time_entry):
 @pytest.mark.models
 def test_active_timer_is_active(app, active_timer):
     """Test active timer is_active property."""
-    db.session.refresh(active_timer)
     assert active_timer.is_active is True
     assert active_timer.end_time is None
 
@@ -235,11 +231,9 @@ def test_active_timer_is_active(app, active_timer):
 @pytest.mark.models
 def test_stop_timer(app, active_timer):
     """Test stopping an active timer."""
-    db.session.refresh(active_timer)
     active_timer.stop_timer()
     db.session.commit()
     
-    db.session.refresh(active_timer)
     assert active_timer.is_active is False
     assert active_timer.end_time is not None
     assert active_timer.duration_seconds > 0
@@ -271,10 +265,27 @@ def test_time_entry_tag_list(app, test_client):
     db.session.add(entry)
     db.session.commit()
     
-    db.session.refresh(entry)
     assert entry.tag_list == ['python', 'testing', 'development']
 
 
+@pytest.mark.unit
+@pytest.mark.models
+@pytest.mark.database
+@pytest.mark.parametrize('where, index', [
+    ('user_id = 1 AND start_time >= :since AND billable = 1', 'ix_te_user_start_billable'),
+    ('project_id = 1 AND start_time >= :since', 'ix_te_project_start'),
+])
+def test_time_entry_range_scans_use_composite_index(app, where, index):
+    """Test per-user/per-project period scans are index range searches."""
+    from sqlalchemy import text
+    
+    plan = db.session.execute(
+        text(f'EXPLAIN QUERY PLAN SELECT SUM(duration_seconds) FROM time_entries WHERE {where}'),
+        {'since': datetime(2024, 1, 1)}
+    ).all()
+    assert any(f'USING INDEX {index}' in row[-1] for row in plan)
+
+
 # ============================================================================
 # Task Model Tests
 # ============================================================================
@@ -283,7 +294,6 @@ def test_time_entry_tag_list(app, test_client):
 @pytest.mark.models
 def test_task_creation(app, task):
     """Test basic task creation."""
-    db.session.refresh(task)
     assert task.id is not None
     assert task.name == 'Test Task'
     assert task.status == 'todo'
@@ -293,8 +303,6 @@ def test_task_creation(app, task):
 @pytest.mark.models
 def test_task_project_relationship(app, task, project):
     """Test task project relationship."""
-    db.session.refresh(task)
-    db.session.refresh(project)
     assert task.project_id == project.id
 
 
@@ -302,8 +310,6 @@ def test_task_project_relationship(app, task, project):
 @pytest.mark.models
 def test_task_status_transitions(app, task):
     """Test task status transitions."""
-    db.session.refresh(task)
-    
     # Mark as in progress
     task.status = 'in_progress'
     db.session.commit()
@@ -339,6 +345,28 @@ def test_invoice_number_generation(app):
     assert 'INV-' in invoice_number
 
 
+@pytest.mark.unit
+@pytest.mark.models
+def test_invoice_number_advances_after_insert(app, invoice):
+    """Test invoice numbers advance past newly inserted invoices."""
+    next_number = Invoice.generate_invoice_number()
+    assert next_number != invoice.invoice_number
+    
+    second = Invoice(
+        invoice_number=next_number,
+        project_id=invoice.project_id,
+        client_id=invoice.client_id,
+        client_name=invoice.client_name,
+        due_date=invoice.due_date,
+        created_by=invoice.created_by
+    )
+    db.session.add(second)
+    db.session.flush()
+    
+    following = Invoice.generate_invoice_number()
+    assert int(following.split('-')[-1]) == int(next_number.split('-')[-1]) + 1
+
+
 @pytest.mark.unit
 @pytest.mark.models
 def test_invoice_calculate_totals(app, invoice_with_items):
@@ -411,7 +439,6 @@ def test_invoice_overdue_status(app, user, project, test_client):
     db.session.add(overdue_invoice)
     db.session.commit()
     
-    db.session.refresh(overdue_invoice)
     assert overdue_invoice.is_overdue is True
     assert overdue_invoice.days_overdue == 10
 
@@ -72,18 +72,18 @@ def test_user_projects_through_time_entries(app, user, project):
 
 @pytest.mark.unit
 @pytest.mark.models
-def test_client_status_property(test_client):
+def test_client_status_property(readonly_client):
     """Test client status and is_active property"""
-    assert test_client.status in ['active', 'inactive']
-    if test_client.status == 'active':
-        assert test_client.is_active
+    assert readonly_client.status in ['active', 'inactive']
+    if readonly_client.status == 'active':
+        assert readonly_client.is_active
 
 
 @pytest.mark.unit
 @pytest.mark.models
-def test_client_repr(test_client):
+def test_client_repr(readonly_client):
     """Test client repr"""
-    assert repr(test_client) == f'<Client {test_client.name}>'
+    assert repr(readonly_client) == f'<Client {readonly_client.name}>'
 
 
 @pytest.mark.unit
@@ -139,19 +139,19 @@ def test_client_archive_activate_methods(app, test_client):
 
 @pytest.mark.unit
 @pytest.mark.models
-def test_project_status(project):
+def test_project_status(readonly_project):
     """Test project status"""
-    assert project.status in ['active', 'inactive', 'completed']
-    assert hasattr(project, 'is_active')
+    assert readonly_project.status in ['active', 'inactive', 'completed']
+    assert hasattr(readonly_project, 'is_active')
 
 
 @pytest.mark.unit
 @pytest.mark.models
-def test_project_billable_hours(project):
+def test_project_billable_hours(readonly_project):
     """Test project billable hours calculation"""
     # Should return 0 or a number >= 0
-    if hasattr(project, 'total_billable_hours'):
-        assert project.total_billable_hours >= 0
+    if hasattr(readonly_project, 'total_billable_hours'):
+        assert readonly_project.total_billable_hours >= 0
 
 
 @pytest.mark.unit
@@ -345,17 +345,17 @@ def test_time_entry_long_duration(app, user, project):
 
 @pytest.mark.unit
 @pytest.mark.models
-def test_task_str_representation(task):
+def test_task_str_representation(readonly_task):
     """Test task string representation"""
-    str_repr = str(task)
-    assert 'Task' in str_repr or task.name in str_repr
+    str_repr = str(readonly_task)
+    assert 'Task' in str_repr or readonly_task.name in str_repr
 
 
 @pytest.mark.unit
 @pytest.mark.models
-def test_task_repr(task):
+def test_task_repr(readonly_task):
     """Test task repr"""
-    repr_str = repr(task)
+    repr_str = repr(readonly_task)
     assert 'Task' in repr_str
 
 
@@ -601,6 +601,22 @@ def test_settings_update(app):
         assert settings.company_name != original_company
 
 
+@pytest.mark.unit
+@pytest.mark.models
+def test_settings_memoized_per_app_context(app):
+    """Test settings are cached on g and re-read once the row is gone"""
+    with app.app_context():
+        settings = Settings.get_settings()
+        assert Settings.get_settings() is settings
+        
+        db.session.delete(settings)
+        db.session.commit()
+        
+        recreated = Settings.get_settings()
+        assert recreated is not settings
+        assert recreated.id is not None
+
+
 @pytest.mark.unit
 @pytest.mark.models
 def test_settings_currency(app):
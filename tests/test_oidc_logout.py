@@ -11,20 +11,17 @@ from app import db
 @pytest.fixture
 def oidc_user(app):
     """Create a test user with OIDC linkage."""
-    with app.app_context():
-        user = User(
-            username='oidc_test_user',
-            email='oidc@example.com',
-            full_name='OIDC Test User'
-        )
-        # Set OIDC attributes after creation
-        user.oidc_issuer = 'https://idp.example.com'
-        user.oidc_sub = 'test-sub-123'
-        db.session.add(user)
-        db.session.commit()
-        yield user
-        db.session.delete(user)
-        db.session.commit()
+    user = User(
+        username='oidc_test_user',
+        email='oidc@example.com',
+        full_name='OIDC Test User'
+    )
+    # Set OIDC attributes after creation
+    user.oidc_issuer = 'https://idp.example.com'
+    user.oidc_sub = 'test-sub-123'
+    db.session.add(user)
+    db.session.flush()
+    return user
 
 
 @pytest.fixture
@@ -12,26 +12,10 @@ This module tests:
 import pytest
 from datetime import date, datetime, timedelta
 from decimal import Decimal
-from app import create_app, db
+from app import db
 from app.models import User, Project, Client, Invoice, ProjectCost
 
 
-@pytest.fixture
-def app():
-    """Create and configure a test application instance."""
-    app = create_app({
-        'TESTING': True,
-        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
-        'WTF_CSRF_ENABLED': False
-    })
-    
-    with app.app_context():
-        db.create_all()
-        yield app
-        db.session.remove()
-        db.drop_all()
-
-
 @pytest.fixture
 def client_fixture(app):
     """Create a test Flask client."""
@@ -41,68 +25,63 @@ def client_fixture(app):
 @pytest.fixture
 def test_user(app):
     """Create a test user."""
-    with app.app_context():
-        user = User(username='testuser', role='user')
-        db.session.add(user)
-        db.session.commit()
-        return user.id
+    user = User(username='testuser', role='user')
+    db.session.add(user)
+    db.session.flush()
+    return user.id
 
 
 @pytest.fixture
 def test_admin(app):
     """Create a test admin user."""
-    with app.app_context():
-        admin = User(username='admin', role='admin')
-        db.session.add(admin)
-        db.session.commit()
-        return admin.id
+    admin = User(username='admin', role='admin')
+    db.session.add(admin)
+    db.session.flush()
+    return admin.id
 
 
 @pytest.fixture
 def test_client(app):
     """Create a test client."""
-    with app.app_context():
-        client = Client(name='Test Client', description='A test client')
-        db.session.add(client)
-        db.session.commit()
-        return client.id
+    client = Client(name='Test Client', description='A test client')
+    db.session.add(client)
+    db.session.flush()
+    return client.id
 
 
 @pytest.fixture
 def test_project(app, test_client):
     """Create a test project."""
-    with app.app_context():
-        project = Project(
-            name='Test Project',
-            client_id=test_client,
-            description='A test project',
-            billable=True,
-            hourly_rate=Decimal('100.00')
-        )
-        db.session.add(project)
-        db.session.commit()
-        return project.id
+    project = Project(
+        name='Test Project',
+        client_id=test_client,
+        description='A test project',
+        billable=True,
+        hourly_rate=Decimal('100.00')
+    )
+    db.session.add(project)
+    db.session.flush()
+    return project.id
 
 
 @pytest.fixture
 def test_invoice(app, test_client, test_project, test_user):
     """Create a test invoice."""
-    with app.app_context():
-        # Get the client to retrieve client_name
-        client = db.session.get(Client, test_client)
-        invoice = Invoice(
-            invoice_number='INV-TEST-001',
-            project_id=test_project,
-            client_name=client.name,
-            due_date=date.today() + timedelta(days=30),
-            created_by=test_user,
-            client_id=test_client,
-            issue_date=date.today(),
-            status='draft'
-        )
-        db.session.add(invoice)
-        db.session.commit()
-        return invoice.id
+    # Get the client to retrieve client_name
+    client = db.session.get(Client, test_client)
+    invoice = Invoice(
+        invoice_number='INV-TEST-001',
+        project_id=test_project,
+        client_name=client.name,
+        due_date=date.today() + timedelta(days=30),
+        created_by=test_user,
+        client_id=test_client,
+        issue_date=date.today(),
+        status='draft'
+    )
+    db.session.add(invoice)
+    db.session.flush()
+    return invoice.id
 
 
 # Model Tests
@@ -6,7 +6,7 @@ from app.models import User, Project, Task
 
 @pytest.mark.smoke
 @pytest.mark.routes
-def test_create_task_page_has_tips(client, app):
+def test_create_task_page_has_tips(app):
     with app.app_context():
         # Minimal data to render page
         user = User(username='ui_user', role='user')
@@ -14,10 +14,7 @@ def test_create_task_page_has_tips(client, app):
         db.session.add(Project(name='UI Test Project', client='UI Test Client'))
         db.session.commit()
 
-        with client.session_transaction() as sess:
-            sess['_user_id'] = str(user.id)
-            sess['_fresh'] = True
-
+        client = app.test_client(user=user)
         resp = client.get('/tasks/create')
         assert resp.status_code == 200
         assert b'data-testid="task-create-tips"' in resp.data
@@ -25,7 +22,7 @@ def test_create_task_page_has_tips(client, app):
 
 @pytest.mark.smoke
 @pytest.mark.routes
-def test_edit_task_page_has_tips(client, app):
+def test_edit_task_page_has_tips(app):
     with app.app_context():
         # Minimal data to render page
         user = User(username='ui_editor', role='user')
@@ -37,10 +34,7 @@ def test_edit_task_page_has_tips(client, app):
         db.session.add(task)
         db.session.commit()
 
-        with client.session_transaction() as sess:
-            sess['_user_id'] = str(user.id)
-            sess['_fresh'] = True
-
+        client = app.test_client(user=user)
         resp = client.get(f'/tasks/{task.id}/edit')
         assert resp.status_code == 200
         assert b'data-testid="task-edit-tips"' in resp.data
@@ -48,7 +42,7 @@ def test_edit_task_page_has_tips(client, app):
 
 @pytest.mark.smoke
 @pytest.mark.routes
-def test_kanban_board_aria_and_dnd(authenticated_client, app):
+def test_kanban_board_aria_and_dnd(app):
     with app.app_context():
         # Minimal data for rendering board
         user = User(username='kanban_user', role='admin')
@@ -56,12 +50,8 @@ def test_kanban_board_aria_and_dnd(authenticated_client, app):
         db.session.add_all([user, project])
         db.session.commit()
 
-        # login session
-        with authenticated_client.session_transaction() as sess:
-            sess['_user_id'] = str(user.id)
-            sess['_fresh'] = True
-
-        resp = authenticated_client.get('/kanban')
+        client = app.test_client(user=user)
+        resp = client.get('/kanban')
         assert resp.status_code == 200
         html = resp.get_data(as_text=True)
         # ARIA presence on board wrapper and columns
@@ -1,50 +1,33 @@
 import pytest
 from datetime import datetime, timedelta
-from app import create_app, db
+from app import db
 from app.models import Settings, TimeEntry, User, Project
 from app.utils.timezone import get_app_timezone, utc_to_local, local_to_utc, now_in_app_timezone
 
 
-@pytest.fixture
-def app():
-    """Create application for testing"""
-    app = create_app({
-        'TESTING': True,
-        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
-        'WTF_CSRF_ENABLED': False,
-        'SECRET_KEY': 'test-secret-key'
-    })
-    
-    with app.app_context():
-        db.create_all()
-        yield app
-        db.drop_all()
-
-
-@pytest.fixture
-def client(app):
-    """Create test client"""
-    return app.test_client()
+@pytest.fixture(autouse=True)
+def no_settings(app):
+    """Start each test without a settings row (the shared app seeds one)"""
+    Settings.query.delete()
+    db.session.flush()
 
 
 @pytest.fixture
 def user(app):
     """Create test user"""
-    with app.app_context():
-        user = User(username='testuser', role='user')
-        db.session.add(user)
-        db.session.commit()
-        return user
+    user = User(username='testuser', role='user')
+    db.session.add(user)
+    db.session.flush()
+    return user
 
 
 @pytest.fixture
 def project(app):
     """Create test project"""
-    with app.app_context():
-        project = Project(name='Test Project', client='Test Client', billable=True, hourly_rate=50.0)
-        db.session.add(project)
-        db.session.commit()
-        return project
+    project = Project(name='Test Project', client='Test Client', billable=True, hourly_rate=50.0)
+    db.session.add(project)
+    db.session.flush()
+    return project
 
 
 def test_timezone_default_from_environment(app):
@@ -5,8 +5,8 @@ import datetime
 import os
 import tempfile
 from unittest.mock import patch
-from flask import g
-from werkzeug.exceptions import Forbidden, BadRequest, InternalServerError
+from flask import Flask, g
+from werkzeug.exceptions import HTTPException, Forbidden, BadRequest, InternalServerError
 from sqlalchemy.exc import SQLAlchemyError
 
 from app import db
@@ -26,7 +26,6 @@ from app.utils.db import safe_commit
 @pytest.mark.utils
 def test_local_datetime_filter(app):
     """Test local_datetime filter with valid datetime."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('local_datetime')
         utc_dt = datetime.datetime(2024, 1, 1, 12, 0, 0)
@@ -39,7 +38,6 @@ def test_local_datetime_filter(app):
 @pytest.mark.utils
 def test_local_datetime_filter_none(app):
     """Test local_datetime filter with None."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('local_datetime')
         result = filter_func(None)
@@ -50,7 +48,6 @@ def test_local_datetime_filter_none(app):
 @pytest.mark.utils
 def test_local_date_filter(app):
     """Test local_date filter."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('local_date')
         utc_dt = datetime.datetime(2024, 1, 1, 12, 0, 0)
@@ -63,7 +60,6 @@ def test_local_date_filter(app):
 @pytest.mark.utils
 def test_local_date_filter_none(app):
     """Test local_date filter with None."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('local_date')
         result = filter_func(None)
@@ -74,7 +70,6 @@ def test_local_date_filter_none(app):
 @pytest.mark.utils
 def test_local_time_filter(app):
     """Test local_time filter."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('local_time')
         utc_dt = datetime.datetime(2024, 1, 1, 12, 0, 0)
@@ -87,7 +82,6 @@ def test_local_time_filter(app):
 @pytest.mark.utils
 def test_local_time_filter_none(app):
     """Test local_time filter with None."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('local_time')
         result = filter_func(None)
@@ -98,7 +92,6 @@ def test_local_time_filter_none(app):
 @pytest.mark.utils
 def test_local_datetime_short_filter(app):
     """Test local_datetime_short filter."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('local_datetime_short')
         utc_dt = datetime.datetime(2024, 1, 1, 12, 0, 0)
@@ -111,7 +104,6 @@ def test_local_datetime_short_filter(app):
 @pytest.mark.utils
 def test_local_datetime_short_filter_none(app):
     """Test local_datetime_short filter with None."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('local_datetime_short')
         result = filter_func(None)
@@ -122,7 +114,6 @@ def test_local_datetime_short_filter_none(app):
 @pytest.mark.utils
 def test_nl2br_filter(app):
     """Test nl2br filter converts newlines to br tags."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('nl2br')
         text = "Line 1\nLine 2\r\nLine 3\rLine 4"
@@ -135,7 +126,6 @@ def test_nl2br_filter(app):
 @pytest.mark.utils
 def test_nl2br_filter_none(app):
     """Test nl2br filter with None."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('nl2br')
         result = filter_func(None)
@@ -146,7 +136,6 @@ def test_nl2br_filter_none(app):
 @pytest.mark.utils
 def test_markdown_filter_empty(app):
     """Test markdown filter with empty text."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('markdown')
         result = filter_func("")
@@ -159,7 +148,6 @@ def test_markdown_filter_empty(app):
 @pytest.mark.utils
 def test_markdown_filter_with_text(app):
     """Test markdown filter with actual markdown."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('markdown')
         text = "# Header\n\n**Bold text**"
@@ -172,7 +160,6 @@ def test_markdown_filter_with_text(app):
 @pytest.mark.utils
 def test_format_date_filter_with_datetime(app):
     """Test format_date filter with datetime object."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('format_date')
         dt = datetime.datetime(2024, 1, 15, 12, 0, 0)
@@ -185,7 +172,6 @@ def test_format_date_filter_with_datetime(app):
 @pytest.mark.utils
 def test_format_date_filter_with_date(app):
     """Test format_date filter with date object."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('format_date')
         dt = datetime.date(2024, 1, 15)
@@ -198,7 +184,6 @@ def test_format_date_filter_with_date(app):
 @pytest.mark.utils
 def test_format_date_filter_formats(app):
     """Test format_date filter with different formats."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('format_date')
         dt = datetime.date(2024, 1, 15)
@@ -216,7 +201,6 @@ def test_format_date_filter_formats(app):
 @pytest.mark.utils
 def test_format_date_filter_none(app):
     """Test format_date filter with None."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('format_date')
         result = filter_func(None)
@@ -227,7 +211,6 @@ def test_format_date_filter_none(app):
 @pytest.mark.utils
 def test_format_date_filter_non_date(app):
     """Test format_date filter with non-date value."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('format_date')
         result = filter_func("not a date")
@@ -238,7 +221,6 @@ def test_format_date_filter_non_date(app):
 @pytest.mark.utils
 def test_format_money_filter(app):
     """Test format_money filter."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('format_money')
         
@@ -259,13 +241,23 @@ def test_format_money_filter(app):
 @pytest.mark.utils
 def test_format_money_filter_invalid(app):
     """Test format_money filter with invalid input."""
-    register_template_filters(app)
     with app.app_context():
         filter_func = app.jinja_env.filters.get('format_money')
         result = filter_func("not a number")
         assert result == "not a number"
 
 
+@pytest.mark.unit
+@pytest.mark.utils
+def test_register_template_filters():
+    """Test register_template_filters adds every filter to an application."""
+    fresh_app = Flask(__name__)
+    register_template_filters(fresh_app)
+    for name in ('local_datetime', 'local_date', 'local_time', 'local_datetime_short',
+                 'nl2br', 'markdown', 'format_date', 'format_money'):
+        assert name in fresh_app.jinja_env.filters
+
+
 # ============================================================================
 # Context Processor Tests
 # ============================================================================
@@ -274,7 +266,6 @@ def test_format_money_filter_invalid(app):
 @pytest.mark.utils
 def test_inject_settings(app, client):
     """Test inject_settings context processor."""
-    register_context_processors(app)
     with app.app_context():
         # Make a request to trigger context processors
         response = client.get('/')
@@ -285,7 +276,6 @@ def test_inject_settings(app, client):
 @pytest.mark.utils
 def test_inject_globals(app, client):
     """Test inject_globals context processor."""
-    register_context_processors(app)
     with app.app_context():
         response = client.get('/')
         assert response is not None
@@ -295,7 +285,6 @@ def test_inject_globals(app, client):
 @pytest.mark.utils
 def test_before_request(app, client):
     """Test before_request function."""
-    register_context_processors(app)
     with app.test_request_context('/'):
         # Trigger before_request
         app.preprocess_request()
@@ -303,15 +292,49 @@ def test_before_request(app, client):
         assert hasattr(g, 'request_start_time')
 
 
+@pytest.mark.unit
+@pytest.mark.utils
+def test_register_context_processors():
+    """Test register_context_processors adds the processors and before_request hook."""
+    fresh_app = Flask(__name__)
+    register_context_processors(fresh_app)
+    assert len(fresh_app.template_context_processors[None]) == 3  # Flask's own + 2
+    assert len(fresh_app.before_request_funcs[None]) == 1
+
+
 # ============================================================================
 # Error Handler Tests
 # ============================================================================
 
+def _raise(error):
+    """A stand-in for a function a view calls, raising ``error``."""
+    def fail(*args, **kwargs):
+        raise error
+    return fail
+
+
+def _handle_error(app, path, error):
+    """Run ``error`` through the app's error handlers as if a view at ``path`` raised it."""
+    with app.test_request_context(path):
+        app.preprocess_request()
+        return app.make_response(app.handle_user_exception(error))
+
+
+@pytest.mark.unit
+@pytest.mark.utils
+def test_register_error_handlers():
+    """Test register_error_handlers covers the status codes and exception types."""
+    fresh_app = Flask(__name__)
+    register_error_handlers(fresh_app)
+    handlers = fresh_app.error_handler_spec[None]
+    assert {400, 403, 404, 500} <= set(handlers)
+    assert {HTTPException, Exception} <= set(handlers[None])
+
+
 @pytest.mark.unit
 @pytest.mark.utils
 def test_404_error_html(app, client):
     """Test 404 error handler returns HTML for non-API routes."""
-    register_error_handlers(app)
     response = client.get('/nonexistent-page')
     assert response.status_code == 404
 
@@ -320,7 +343,6 @@ def test_404_error_html(app, client):
 @pytest.mark.utils
 def test_404_error_api(app, client):
     """Test 404 error handler returns JSON for API routes."""
-    register_error_handlers(app)
     response = client.get('/api/nonexistent')
     assert response.status_code == 404
     # Should return JSON
@@ -331,29 +353,17 @@ def test_404_error_api(app, client):
 
 @pytest.mark.unit
 @pytest.mark.utils
-def test_500_error_html(app, client):
+def test_500_error_html(app):
     """Test 500 error handler returns HTML for non-API routes."""
-    register_error_handlers(app)
-    
-    @app.route('/test-500')
-    def test_500():
-        raise Exception("Test error")
-    
-    response = client.get('/test-500')
+    response = _handle_error(app, '/test-500', Exception("Test error"))
     assert response.status_code == 500
 
 
 @pytest.mark.unit
 @pytest.mark.utils
-def test_500_error_api(app, client):
+def test_500_error_api(app):
     """Test 500 error handler returns JSON for API routes."""
-    register_error_handlers(app)
-    
-    @app.route('/api/test-500')
-    def test_api_500():
-        raise Exception("Test API error")
-    
-    response = client.get('/api/test-500')
+    response = _handle_error(app, '/api/test-500', Exception("Test API error"))
     assert response.status_code == 500
     if response.content_type and 'json' in response.content_type:
         data = response.get_json()
@@ -362,60 +372,43 @@ def test_500_error_api(app, client):
 
 @pytest.mark.unit
 @pytest.mark.utils
-def test_403_error_html(app, client):
+def test_403_error_html(authenticated_client, monkeypatch):
     """Test 403 error handler returns HTML for non-API routes."""
-    register_error_handlers(app)
-    
-    @app.route('/test-403')
-    def test_403():
-        raise Forbidden("Forbidden")
+    from app.routes import analytics
+    monkeypatch.setattr(analytics, 'render_template', _raise(Forbidden("Forbidden")))
     
-    response = client.get('/test-403')
+    response = authenticated_client.get('/analytics')
     assert response.status_code == 403
+    assert response.mimetype == 'text/html'
 
 
 @pytest.mark.unit
 @pytest.mark.utils
-def test_403_error_api(app, client):
+def test_403_error_api(authenticated_client, monkeypatch):
     """Test 403 error handler returns JSON for API routes."""
-    register_error_handlers(app)
+    from app.routes import analytics
+    monkeypatch.setattr(analytics, 'daily_hours_available', _raise(Forbidden("Forbidden")))
     
-    @app.route('/api/test-403')
-    def test_api_403():
-        raise Forbidden("Forbidden")
-    
-    response = client.get('/api/test-403')
+    response = authenticated_client.get('/api/analytics/hours-by-day')
     assert response.status_code == 403
-    if response.content_type and 'json' in response.content_type:
-        data = response.get_json()
-        assert 'error' in data
+    assert response.get_json() == {'error': 'Forbidden'}
+    # after_request hooks still run for handled errors
+    assert 'Content-Security-Policy' in response.headers
 
 
 @pytest.mark.unit
 @pytest.mark.utils
-def test_400_error_html(app, client):
+def test_400_error_html(app):
     """Test 400 error handler returns HTML for non-API routes."""
-    register_error_handlers(app)
-    
-    @app.route('/test-400')
-    def test_400():
-        raise BadRequest("Bad request")
-    
-    response = client.get('/test-400')
+    response = _handle_error(app, '/test-400', BadRequest("Bad request"))
     assert response.status_code == 400
 
 
 @pytest.mark.unit
 @pytest.mark.utils
-def test_400_error_api(app, client):
+def test_400_error_api(app):
     """Test 400 error handler returns JSON for API routes."""
-    register_error_handlers(app)
-    
-    @app.route('/api/test-400')
-    def test_api_400():
-        raise BadRequest("Bad request")
-    
-    response = client.get('/api/test-400')
+    response = _handle_error(app, '/api/test-400', BadRequest("Bad request"))
     assert response.status_code == 400
     if response.content_type and 'json' in response.content_type:
         data = response.get_json()
@@ -424,15 +417,9 @@ def test_400_error_api(app, client):
 
 @pytest.mark.unit
 @pytest.mark.utils
-def test_http_exception_handler(app, client):
+def test_http_exception_handler(app):
     """Test generic HTTP exception handler."""
-    register_error_handlers(app)
-    
-    @app.route('/test-http-exception')
-    def test_http():
-        raise InternalServerError("Server error")
-    
-    response = client.get('/test-http-exception')
+    response = _handle_error(app, '/test-http-exception', InternalServerError("Server error"))
     assert response.status_code == 500
 
 